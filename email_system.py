@@ -15,6 +15,9 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 import ssl
+import socket
+import atexit
+import threading
 from pathlib import Path
 
 from state_manager import StateManager
@@ -39,6 +42,11 @@ class EmailSystem:
         # Email settings
         self.enabled = all([self.email_user, self.email_password])
         
+        # Persistent SMTP connection, reused across sends by long-running processes
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+        atexit.register(self._close_smtp)
+        
         if not self.enabled:
             self.logger.warning("Email system disabled - missing EMAIL_USER or EMAIL_PASSWORD")
         else:
@@ -98,20 +106,61 @@ class EmailSystem:
                         )
                         msg.attach(part)
             
-            # Send email
-            context = ssl.create_default_context()
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls(context=context)
-                server.login(self.email_user, self.email_password)
-                server.send_message(msg)
+            # Send email, retrying once on a fresh connection if the pooled one
+            # died. Other SMTP errors are server replies to this message, so a
+            # resend could deliver it twice; those propagate instead
+            with self._smtp_lock:
+                try:
+                    self._get_smtp().send_message(msg)
+                except (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout):
+                    self._close_smtp_locked()
+                    self._get_smtp().send_message(msg)
             
             self.logger.info(f"Email sent successfully: {subject}")
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to send email: {e}")
+            with self._smtp_lock:
+                self._close_smtp_locked()
             return False
     
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return a live, authenticated SMTP connection (caller holds _smtp_lock)"""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp_locked()
+        
+        context = ssl.create_default_context()
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls(context=context)
+            server.login(self.email_user, self.email_password)
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        return server
+    
+    def _close_smtp_locked(self) -> None:
+        """Drop the pooled SMTP connection (caller holds _smtp_lock)"""
+        server, self._smtp = self._smtp, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+    
+    def _close_smtp(self) -> None:
+        """Close the pooled SMTP connection, if any"""
+        with self._smtp_lock:
+            self._close_smtp_locked()
+    
     def send_reward_notification(self, reward_info: Dict[str, Any]) -> bool:
         """
         Send reward notification email
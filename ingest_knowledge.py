@@ -5,29 +5,101 @@ Builds vector database from OpenAI docs and grey literature
 """
 
 import os
-import json
+import math
+import atexit
 import logging
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit
 from pathlib import Path
 import time
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import hashlib
 from datetime import datetime, timezone
 
+import orjson
 import chromadb
 from chromadb.config import Settings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from sentence_transformers import SentenceTransformer
 
 
+# Domains (including their subdomains) whose search results are never worth scraping
+SKIP_HOSTS = frozenset({"youtube.com", "twitter.com", "facebook.com"})
+
+
+def should_skip_url(url: str) -> bool:
+    """Check a search result URL against the skip list with a single parse"""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    # Compare the host and each parent domain, so subdomains match on dot boundaries
+    labels = host.split(".")
+    if any(".".join(labels[i:]) in SKIP_HOSTS for i in range(len(labels) - 1)):
+        return True
+    # Reddit threads are noisy, but other reddit pages are fine
+    return (host == "reddit.com" or host.endswith(".reddit.com")) and parts.path.startswith("/r/")
+
+
+class ChunkBloomFilter:
+    """
+    Fixed-size Bloom filter over chunk IDs, persisted as a raw bit array.
+    
+    Chunk IDs are already MD5 hex digests, so bit positions are derived
+    from the digest itself with double hashing instead of rehashing.
+    """
+    
+    def __init__(self, path: Path, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.path = Path(path)
+        self.num_bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self._dirty = False
+        
+        if self.path.exists():
+            data = self.path.read_bytes()
+            # A size mismatch means the filter parameters changed; start fresh
+            if len(data) == len(self.bits):
+                self.bits = bytearray(data)
+    
+    def _positions(self, chunk_id: str):
+        digest = bytes.fromhex(chunk_id)
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+    
+    def __contains__(self, chunk_id: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(chunk_id))
+    
+    def add(self, chunk_id: str) -> None:
+        for pos in self._positions(chunk_id):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self._dirty = True
+    
+    def save(self) -> None:
+        """Write the bit array to disk if it changed since the last save"""
+        if not self._dirty:
+            return
+        
+        temp_file = self.path.with_suffix(".tmp")
+        temp_file.write_bytes(self.bits)
+        os.replace(temp_file, self.path)
+        self._dirty = False
+
+
 class KnowledgeBaseIngester:
     """
     Ingests knowledge from various sources and creates a vector database
     for the veracity module to query
     """
     
+    # Upper bound on raw HTML downloaded per grey-literature page
+    MAX_PAGE_BYTES = 200_000
+    
+    # Minimum spacing between Brave Search requests (free tier allows 1 req/sec)
+    BRAVE_MIN_INTERVAL = 1.0
+    
     def __init__(self, db_path: str = "data/chroma_db"):
         self.db_path = Path(db_path)
         self.db_path.mkdir(parents=True, exist_ok=True)
@@ -43,6 +115,10 @@ class KnowledgeBaseIngester:
             )
         )
         
+        # Chunk IDs already stored, persisted across runs
+        self.seen_chunks = ChunkBloomFilter(self.db_path / "seen_chunks.bloom")
+        atexit.register(self.seen_chunks.save)
+        
         # Initialize embedding model
         self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
         
@@ -70,6 +146,11 @@ class KnowledgeBaseIngester:
             "https://openai.com/api/pricing/"
         ]
         
+        # Shared connection pool for Brave Search requests
+        self.search_session = requests.Session()
+        self._brave_rate_lock = threading.Lock()
+        self._brave_next_slot = 0.0
+        
         # Grey literature search terms for Brave Search
         self.grey_search_terms = [
             "ChatGPT system prompt reverse engineering",
@@ -99,39 +180,49 @@ class KnowledgeBaseIngester:
         
         self.logger.info("Starting knowledge base ingestion")
         
-        # Ingest official OpenAI documentation
-        for url in self.official_sources:
-            try:
-                chunk_count = self.ingest_official_docs(url)
-                results["official_docs"][url] = chunk_count
-                results["total_chunks"] += chunk_count
-                self.logger.info(f"Ingested {chunk_count} chunks from {url}")
-                time.sleep(1)  # Rate limiting
-                
-            except Exception as e:
-                error_msg = f"Failed to ingest {url}: {str(e)}"
-                results["errors"].append(error_msg)
-                self.logger.error(error_msg)
-        
-        # Ingest grey literature via Brave Search
-        if os.getenv("BRAVE_API_KEY"):
-            for search_term in self.grey_search_terms:
+        # Ingest official OpenAI documentation. Embedding runs on a single
+        # background worker so the next page downloads while the previous one
+        # is being encoded; at most one embed job is in flight at a time.
+        with ThreadPoolExecutor(max_workers=1) as embed_pool:
+            pending = None
+            
+            for url in self.official_sources:
                 try:
-                    chunk_count = self.ingest_grey_literature(search_term)
-                    results["grey_literature"][search_term] = chunk_count
-                    results["total_chunks"] += chunk_count
-                    self.logger.info(f"Ingested {chunk_count} chunks for '{search_term}'")
-                    time.sleep(2)  # More conservative rate limiting
+                    content, title = self.fetch_official_doc(url)
                     
                 except Exception as e:
-                    error_msg = f"Failed to search '{search_term}': {str(e)}"
+                    error_msg = f"Failed to ingest {url}: {str(e)}"
                     results["errors"].append(error_msg)
                     self.logger.error(error_msg)
+                    continue
+                
+                if pending:
+                    self._collect_official_result(results, *pending)
+                
+                pending = (url, embed_pool.submit(
+                    self.process_and_store_content,
+                    content=content,
+                    source_url=url,
+                    source_type="official_docs",
+                    title=title
+                ))
+                time.sleep(1)  # Rate limiting
+            
+            if pending:
+                self._collect_official_result(results, *pending)
+        
+        # Ingest grey literature via Brave Search
+        if os.getenv("BRAVE_API_KEY"):
+            chunk_counts, errors = self.ingest_grey_literature_batch(self.grey_search_terms)
+            results["grey_literature"].update(chunk_counts)
+            results["total_chunks"] += sum(chunk_counts.values())
+            results["errors"].extend(errors)
         else:
             results["errors"].append("BRAVE_API_KEY not set - skipping grey literature")
         
         # Save ingestion metadata
         self.save_ingestion_metadata(results)
+        self.seen_chunks.save()
         
         self.logger.info(f"Ingestion completed: {results['total_chunks']} total chunks")
         return results
@@ -146,6 +237,25 @@ class KnowledgeBaseIngester:
         Returns:
             Number of chunks created
         """
+        content, title = self.fetch_official_doc(url)
+        
+        return self.process_and_store_content(
+            content=content,
+            source_url=url,
+            source_type="official_docs",
+            title=title
+        )
+    
+    def fetch_official_doc(self, url: str) -> Tuple[str, str]:
+        """
+        Download an official documentation page and extract its main text
+        
+        Args:
+            url: URL to scrape
+            
+        Returns:
+            Tuple of (extracted content, page title)
+        """
         headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
@@ -174,12 +284,20 @@ class KnowledgeBaseIngester:
             # Fallback: get all text
             content = soup.get_text(separator='\n', strip=True)
         
-        return self.process_and_store_content(
-            content=content,
-            source_url=url,
-            source_type="official_docs",
-            title=soup.title.string if soup.title else url
-        )
+        return content, (soup.title.string if soup.title else url)
+    
+    def _collect_official_result(self, results: Dict[str, Any], url: str, future: Future) -> None:
+        """Wait for a background embed job and record its outcome in results"""
+        try:
+            chunk_count = future.result()
+            results["official_docs"][url] = chunk_count
+            results["total_chunks"] += chunk_count
+            self.logger.info(f"Ingested {chunk_count} chunks from {url}")
+            
+        except Exception as e:
+            error_msg = f"Failed to ingest {url}: {str(e)}"
+            results["errors"].append(error_msg)
+            self.logger.error(error_msg)
     
     def ingest_grey_literature(self, search_term: str) -> int:
         """
@@ -191,6 +309,52 @@ class KnowledgeBaseIngester:
         Returns:
             Number of chunks created
         """
+        search_results = self.search_brave(search_term)
+        return self._ingest_search_results(search_term, search_results)
+    
+    def ingest_grey_literature_batch(self, search_terms: List[str]) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Run all Brave searches concurrently, then ingest the deduplicated results
+        
+        Args:
+            search_terms: Search queries
+            
+        Returns:
+            Tuple of (chunks created per search term, error messages)
+        """
+        chunk_counts = {}
+        errors = []
+        seen_urls = set()
+        
+        with ThreadPoolExecutor(max_workers=max(1, len(search_terms))) as pool:
+            futures = [pool.submit(self.search_brave, term) for term in search_terms]
+            
+            # Scrape each term's results as soon as its search has returned,
+            # keeping the configured term order
+            for search_term, future in zip(search_terms, futures):
+                try:
+                    search_results = future.result()
+                    chunk_count = self._ingest_search_results(search_term, search_results, seen_urls)
+                    chunk_counts[search_term] = chunk_count
+                    self.logger.info(f"Ingested {chunk_count} chunks for '{search_term}'")
+                    
+                except Exception as e:
+                    error_msg = f"Failed to search '{search_term}': {str(e)}"
+                    errors.append(error_msg)
+                    self.logger.error(error_msg)
+        
+        return chunk_counts, errors
+    
+    def search_brave(self, search_term: str) -> List[Dict[str, Any]]:
+        """
+        Query the Brave Search API, respecting the configured request rate
+        
+        Args:
+            search_term: Search query
+            
+        Returns:
+            Top web results for the query
+        """
         brave_api_key = os.getenv("BRAVE_API_KEY")
         if not brave_api_key:
             raise ValueError("BRAVE_API_KEY environment variable not set")
@@ -210,24 +374,56 @@ class KnowledgeBaseIngester:
             "text_decorations": False
         }
         
-        response = requests.get(search_url, headers=headers, params=params, timeout=30)
+        self._wait_for_brave_slot()
+        response = self.search_session.get(search_url, headers=headers, params=params, timeout=30)
         response.raise_for_status()
         
         search_results = response.json()
+        return search_results.get("web", {}).get("results", [])[:5]  # Limit to top 5
+    
+    def _wait_for_brave_slot(self) -> None:
+        """Block until the next Brave request is allowed under the rate limit"""
+        with self._brave_rate_lock:
+            now = time.monotonic()
+            wait = self._brave_next_slot - now
+            self._brave_next_slot = max(now, self._brave_next_slot) + self.BRAVE_MIN_INTERVAL
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _ingest_search_results(
+        self,
+        search_term: str,
+        search_results: List[Dict[str, Any]],
+        seen_urls: Optional[set] = None
+    ) -> int:
+        """
+        Fetch and store the pages behind a set of search results
+        
+        Args:
+            search_term: Search query the results came from
+            search_results: Brave web results
+            seen_urls: URLs already ingested in this run (updated in place)
+            
+        Returns:
+            Number of chunks created
+        """
+        if seen_urls is None:
+            seen_urls = set()
         
         total_chunks = 0
         
         # Process each search result
-        for result in search_results.get("web", {}).get("results", [])[:5]:  # Limit to top 5
+        for result in search_results:
             try:
                 url = result.get("url", "")
                 title = result.get("title", "")
                 description = result.get("description", "")
                 
-                # Skip certain domains
-                skip_domains = ["youtube.com", "reddit.com/r/", "twitter.com", "facebook.com"]
-                if any(domain in url.lower() for domain in skip_domains):
+                # Skip certain domains and pages another search already returned
+                if should_skip_url(url) or url in seen_urls:
                     continue
+                seen_urls.add(url)
                 
                 # Try to fetch the full content
                 content = self.fetch_webpage_content(url)
@@ -267,10 +463,19 @@ class KnowledgeBaseIngester:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
+            # Stream the body and stop once the byte cap is reached so oversized
+            # pages never get fully downloaded or handed to BeautifulSoup
+            with requests.get(url, headers=headers, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                
+                content_bytes = bytearray()
+                for chunk in response.iter_content(chunk_size=65536):
+                    content_bytes += chunk
+                    if len(content_bytes) >= self.MAX_PAGE_BYTES:
+                        del content_bytes[self.MAX_PAGE_BYTES:]
+                        break
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(bytes(content_bytes), 'html.parser')
             
             # Remove script and style elements
             for script in soup(["script", "style", "nav", "footer", "header"]):
@@ -322,17 +527,20 @@ class KnowledgeBaseIngester:
         if not chunks:
             return 0
         
-        # Generate embeddings
-        embeddings = self.embedding_model.encode(chunks).tolist()
-        
-        # Create document IDs and metadata
+        # Create document IDs and metadata, skipping chunks stored by an
+        # earlier run so they are never re-embedded
         ids = []
+        documents = []
         metadatas = []
         
         for i, chunk in enumerate(chunks):
             # Create unique ID
             chunk_id = hashlib.md5(f"{source_url}_{i}_{chunk[:100]}".encode()).hexdigest()
+            if chunk_id in self.seen_chunks:
+                continue
+            
             ids.append(chunk_id)
+            documents.append(chunk)
             
             # Create metadata
             metadata = {
@@ -349,15 +557,24 @@ class KnowledgeBaseIngester:
             
             metadatas.append(metadata)
         
+        if not documents:
+            return 0
+        
+        # Generate embeddings
+        embeddings = self.embedding_model.encode(documents).tolist()
+        
         # Store in ChromaDB
         self.collection.add(
-            documents=chunks,
+            documents=documents,
             embeddings=embeddings,
             metadatas=metadatas,
             ids=ids
         )
         
-        return len(chunks)
+        for chunk_id in ids:
+            self.seen_chunks.add(chunk_id)
+        
+        return len(documents)
     
     def query_knowledge_base(
         self, 
@@ -376,26 +593,53 @@ class KnowledgeBaseIngester:
         Returns:
             List of relevant documents with metadata
         """
+        return self.query_knowledge_base_batch([query], n_results, source_type)[0]
+    
+    def query_knowledge_base_batch(
+        self, 
+        queries: List[str], 
+        n_results: int = 10,
+        source_type: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Query the knowledge base for several queries in one collection call
+        
+        Args:
+            queries: Search queries
+            n_results: Number of results to return per query
+            source_type: Filter by source type (optional)
+            
+        Returns:
+            One list of relevant documents with metadata per query, in query order
+        """
+        if not queries:
+            return []
+        
         where_filter = {}
         if source_type:
             where_filter["source_type"] = source_type
         
         results = self.collection.query(
-            query_texts=[query],
+            query_texts=queries,
             n_results=n_results,
             where=where_filter if where_filter else None
         )
         
         # Format results
-        formatted_results = []
-        for i in range(len(results['documents'][0])):
-            formatted_results.append({
-                "content": results['documents'][0][i],
-                "metadata": results['metadatas'][0][i],
-                "distance": results['distances'][0][i]
-            })
-        
-        return formatted_results
+        formatted_batches = []
+        for documents, metadatas, distances in zip(
+            results['documents'], results['metadatas'], results['distances']
+        ):
+            formatted_batches.append([
+                {
+                    "content": document,
+                    "metadata": metadata,
+                    "distance": distance
+                }
+                for document, metadata, distance in zip(documents, metadatas, distances)
+            ])
+        
+        return formatted_batches
     
     def get_database_stats(self) -> Dict[str, Any]:
         """Get statistics about the knowledge database"""
@@ -431,8 +675,8 @@ class KnowledgeBaseIngester:
         metadata_file = self.db_path / "ingestion_metadata.json"
         
         try:
-            with open(metadata_file, 'w') as f:
-                json.dump(results, f, indent=2)
+            with open(metadata_file, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
                 
         except Exception as e:
             self.logger.error(f"Failed to save ingestion metadata: {e}")
@@ -472,11 +716,11 @@ def main():
         else:
             results = ingester.ingest_all_sources()
         
-        print(json.dumps(results, indent=2))
+        print(orjson.dumps(results, option=orjson.OPT_INDENT_2).decode())
     
     elif args.stats:
         stats = ingester.get_database_stats()
-        print(json.dumps(stats, indent=2))
+        print(orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode())
     
     elif args.query:
         results = ingester.query_knowledge_base(args.query)
@@ -5,13 +5,16 @@ Advanced logging, monitoring, and alert management
 """
 
 import os
+import re
+import atexit
 import logging
 import json
 import time
+from collections import Counter
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, Any, List, Optional
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler, QueueHandler, QueueListener
 import threading
 import queue
 import subprocess
@@ -21,6 +24,15 @@ from state_manager import StateManager
 from email_system import EmailSystem
 
 
+# Standard LogRecord attributes; anything else on a record came from `extra`
+_STD_LOGRECORD_KEYS = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
+    'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
+    'thread', 'threadName', 'processName', 'process', 'message',
+    'exc_info', 'exc_text', 'stack_info', 'taskName'
+})
+
+
 class LogLevel:
     """Log level constants"""
     DEBUG = 10
@@ -35,6 +47,26 @@ class ModelRealignmentLogger:
     Advanced logging system with structured logging, alerts, and monitoring
     """
     
+    # Health is sampled every 5 minutes but only written when a metric moves
+    # by more than these deltas (percentage points), or every 12th tick
+    HEALTH_LOG_DELTAS = {
+        "cpu_percent": 5.0,
+        "memory_percent": 3.0,
+        "disk_percent": 1.0
+    }
+    HEALTH_CHECKPOINT_TICKS = 12
+    
+    # Summary keywords in priority order; each log line is counted once,
+    # under the first keyword it contains
+    _SUMMARY_KEYWORDS = (
+        (b"VIOLATION", "violations"),
+        (b"REWARD", "rewards"),
+        (b"ERROR", "errors"),
+        (b"WARNING", "warnings")
+    )
+    _LINE_TIMESTAMP = re.compile(rb'^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d', re.MULTILINE)
+    _SUMMARY_BLOCK_BYTES = 256 * 1024
+    
     def __init__(self, log_dir: str = "logs"):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
@@ -47,23 +79,57 @@ class ModelRealignmentLogger:
             "error_count_threshold": 5,  # Errors per hour
             "critical_immediate": True,  # Send critical alerts immediately
             "warning_batch_time": 300,   # Batch warnings for 5 minutes
+            "warning_batch_size": 20,    # Flush early once this many are pending
             "disk_space_threshold": 90,  # Percentage
             "memory_threshold": 85       # Percentage
         }
         
-        # Alert state tracking
+        # Alert state tracking; interval timestamps use time.monotonic()
+        self._next_reset_ts = time.monotonic() + 3600
         self.alert_counts = {
             "errors_last_hour": 0,
             "warnings_last_batch": 0,
             "last_error_alert": None,
             "last_warning_batch": None
         }
+        # An error alert waiting on the email worker; last_error_alert is only
+        # set once it has actually been sent
+        self._error_alert_lock = threading.Lock()
+        self._error_alert_pending = False
         
-        # Initialize loggers
+        # Initialize loggers; file writes happen on the queue listener thread
         self.setup_loggers()
+        self.queue_listener.start()
+        self._listener_running = True
+        # Short-lived CLI processes never call shutdown(); drain the queue at exit
+        atexit.register(self._stop_listener)
+        
+        # Health probe setup: seed psutil's CPU counters so later non-blocking
+        # cpu_percent() calls report usage since the previous sample
+        psutil.cpu_percent(interval=None)
+        # Hold the project directory open so disk usage is one fstatvfs call
+        # and stays tied to this directory even if the process chdirs later
+        self._cwd_fd = os.open(".", os.O_RDONLY)
+        self.collect_process_count = os.getenv("LOG_HEALTH_DEBUG", "false").lower() == "true"
+        
+        # API usage sampling: running totals cover every call, sampled or not
+        self._api_sample_rate = max(1, int(os.getenv("API_LOG_SAMPLE", "1")))
+        self._api_agg = {"calls": 0, "tokens": 0, "cost": 0.0}
+        self._api_lock = threading.Lock()
+        
+        # Resource warnings waiting to be sent as one batched summary
+        self._pending_warnings = []
+        self._last_warning_flush = time.monotonic()
+        self._warning_lock = threading.Lock()
+        
+        # Alert emails are sent from a worker so SMTP latency never blocks callers
+        self._alert_queue = queue.Queue(maxsize=1024)
+        self._alert_thread = threading.Thread(target=self._alert_worker, daemon=True)
+        self._alert_thread.start()
         
         # Start monitoring thread
         self.monitoring_active = True
+        self._stop = threading.Event()
         self.monitor_thread = threading.Thread(target=self._system_monitor_loop, daemon=True)
         self.monitor_thread.start()
     
@@ -86,6 +152,11 @@ class ModelRealignmentLogger:
         self.api_logger = logging.getLogger("api_usage")
         self.api_logger.setLevel(logging.INFO)
         
+        # These loggers own their output; don't also hand records to any
+        # root handlers an entry point may have configured
+        for logger in (self.app_logger, self.security_logger, self.health_logger, self.api_logger):
+            logger.propagate = False
+        
         # Set up handlers
         self._setup_handlers()
     
@@ -107,17 +178,15 @@ class ModelRealignmentLogger:
             encoding='utf-8'
         )
         app_handler.setFormatter(detailed_formatter)
-        self.app_logger.addHandler(app_handler)
         
         # Security log - size-based rotation
-        security_handler = RotatingFileHandler(
+        security_handler = ByteCountedRotatingHandler(
             self.log_dir / "security.log",
             maxBytes=10*1024*1024,  # 10MB
             backupCount=10,
             encoding='utf-8'
         )
         security_handler.setFormatter(detailed_formatter)
-        self.security_logger.addHandler(security_handler)
         
         # System health log
         health_handler = TimedRotatingFileHandler(
@@ -127,7 +196,6 @@ class ModelRealignmentLogger:
             encoding='utf-8'
         )
         health_handler.setFormatter(detailed_formatter)
-        self.health_logger.addHandler(health_handler)
         
         # API usage log with JSON format
         api_handler = TimedRotatingFileHandler(
@@ -137,7 +205,29 @@ class ModelRealignmentLogger:
             encoding='utf-8'
         )
         api_handler.setFormatter(json_formatter)
-        self.api_logger.addHandler(api_handler)
+        
+        # Loggers only enqueue records; a single listener thread does the
+        # formatting, writing and rotation. The listener hands every record to
+        # every handler, so each file handler filters on its logger's name.
+        file_handlers = (
+            (self.app_logger, app_handler),
+            (self.security_logger, security_handler),
+            (self.health_logger, health_handler),
+            (self.api_logger, api_handler)
+        )
+        
+        self.log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(self.log_queue)
+        
+        for logger, handler in file_handlers:
+            handler.addFilter(logging.Filter(logger.name))
+            logger.addHandler(queue_handler)
+        
+        self.queue_listener = QueueListener(
+            self.log_queue,
+            *(handler for _, handler in file_handlers),
+            respect_handler_level=True
+        )
         
         # Console handler for development
         if os.getenv("LOG_CONSOLE", "false").lower() == "true":
@@ -150,11 +240,13 @@ class ModelRealignmentLogger:
     
     def log_violation(self, violation_data: Dict[str, Any]):
         """Log a security violation with structured data"""
+        # %-style args so the message is only built if the record is emitted
         self.security_logger.warning(
-            f"VIOLATION | Type: {violation_data.get('violations', [])} | "
-            f"Points: {violation_data.get('points_change', 0)} | "
-            f"Score: {violation_data.get('new_score', 0)} | "
-            f"Text: {violation_data.get('text_snippet', '')[:100]}..."
+            "VIOLATION | Type: %s | Points: %s | Score: %s | Text: %.100s...",
+            violation_data.get('violations', []),
+            violation_data.get('points_change', 0),
+            violation_data.get('new_score', 0),
+            violation_data.get('text_snippet', '')
         )
         
         # Check if this should trigger an alert
@@ -164,29 +256,69 @@ class ModelRealignmentLogger:
     def log_reward(self, reward_data: Dict[str, Any]):
         """Log a reward event"""
         self.app_logger.info(
-            f"REWARD | Points: +{reward_data.get('points_earned', 0)} | "
-            f"Hours Clean: {reward_data.get('hours_clean', 0)} | "
-            f"New Score: {reward_data.get('new_score', 0)}"
+            "REWARD | Points: +%s | Hours Clean: %s | New Score: %s",
+            reward_data.get('points_earned', 0),
+            reward_data.get('hours_clean', 0),
+            reward_data.get('new_score', 0)
         )
     
     def log_api_usage(self, usage_data: Dict[str, Any]):
-        """Log API usage with structured JSON"""
+        """Log API usage with structured JSON
+        
+        With API_LOG_SAMPLE=N only every Nth call is written; totals for all
+        calls are kept and flushed as periodic api_summary records.
+        """
+        record = {"event_type": "api_call"}
+        
+        # Unsampled logging writes every call, so there is nothing to total
+        if self._api_sample_rate > 1:
+            with self._api_lock:
+                self._api_agg["calls"] += 1
+                self._api_agg["tokens"] += usage_data.get("tokens_used", 0)
+                self._api_agg["cost"] += usage_data.get("cost", 0.0)
+                if self._api_agg["calls"] % self._api_sample_rate:
+                    return
+            # Each sampled record stands for sample_rate calls
+            record["sample_rate"] = self._api_sample_rate
+        
+        record["timestamp"] = datetime.now(timezone.utc).isoformat()
+        self.api_logger.info("", extra={**record, **usage_data})
+    
+    def _flush_api_summary(self):
+        """Write aggregate API usage since the last flush when sampling is on"""
+        if self._api_sample_rate == 1:
+            return
+        
+        with self._api_lock:
+            if not self._api_agg["calls"]:
+                return
+            totals = self._api_agg
+            self._api_agg = {"calls": 0, "tokens": 0, "cost": 0.0}
+        
         self.api_logger.info("", extra={
-            "event_type": "api_call",
+            "event_type": "api_summary",
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            **usage_data
+            "sample_rate": self._api_sample_rate,
+            "calls": totals["calls"],
+            "tokens_used": totals["tokens"],
+            "cost": round(totals["cost"], 6)
         })
     
     def log_system_health(self, health_data: Dict[str, Any]):
         """Log system health metrics"""
-        self.health_logger.info(
-            f"HEALTH | CPU: {health_data.get('cpu_percent', 0):.1f}% | "
-            f"Memory: {health_data.get('memory_percent', 0):.1f}% | "
-            f"Disk: {health_data.get('disk_percent', 0):.1f}% | "
-            f"Score: {health_data.get('current_score', 0)}"
-        )
+        if self.health_logger.isEnabledFor(logging.INFO):
+            self.health_logger.info(
+                "HEALTH | CPU: %.1f%% | Memory: %.1f%% | Disk: %.1f%% | Score: %s",
+                health_data.get('cpu_percent', 0),
+                health_data.get('memory_percent', 0),
+                health_data.get('disk_percent', 0),
+                health_data.get('current_score', 0)
+            )
         
-        # Check for resource alerts
+        self._check_resource_thresholds(health_data)
+    
+    def _check_resource_thresholds(self, health_data: Dict[str, Any]):
+        """Queue resource warnings for any metric above its alert threshold"""
         if health_data.get('memory_percent', 0) > self.alert_config['memory_threshold']:
             self._trigger_resource_alert("memory", health_data.get('memory_percent', 0))
         
@@ -211,94 +343,179 @@ class ModelRealignmentLogger:
         self.app_logger.critical(f"CRITICAL | {critical_msg}")
         
         if self.alert_config["critical_immediate"]:
-            self.email_system.send_system_health_alert(
-                "critical",
-                f"CRITICAL EVENT: {critical_msg}"
-            )
+            self._enqueue_alert("critical", f"CRITICAL EVENT: {critical_msg}")
     
     def _trigger_violation_alert(self, violation_data: Dict[str, Any]):
         """Trigger email alert for serious violations"""
-        try:
-            self.email_system.send_violation_alert(violation_data)
-        except Exception as e:
-            self.app_logger.error(f"Failed to send violation alert: {e}")
+        self._enqueue_alert("violation", violation_data)
     
     def _trigger_error_alert(self):
         """Trigger email alert for high error count"""
-        now = datetime.now(timezone.utc)
-        
-        # Avoid spamming - only send once per hour
-        if (self.alert_counts["last_error_alert"] and 
-            (now - self.alert_counts["last_error_alert"]).seconds < 3600):
-            return
-        
-        try:
-            self.email_system.send_system_health_alert(
+        with self._error_alert_lock:
+            last = self.alert_counts["last_error_alert"]
+            
+            # Avoid spamming - only send once per hour, and one at a time
+            if self._error_alert_pending or (last is not None and time.monotonic() - last < 3600):
+                return
+            
+            self._error_alert_pending = self._enqueue_alert(
                 "error",
                 f"High error count detected: {self.alert_counts['errors_last_hour']} errors in the last hour"
             )
-            self.alert_counts["last_error_alert"] = now
-        except Exception as e:
-            self.app_logger.error(f"Failed to send error alert: {e}")
+    
+    def _finish_error_alert(self, sent: bool):
+        """Start the error alert cooldown after a successful send, or clear it after a failure"""
+        with self._error_alert_lock:
+            self._error_alert_pending = False
+            self.alert_counts["last_error_alert"] = time.monotonic() if sent else None
     
     def _trigger_resource_alert(self, resource_type: str, usage_percent: float):
-        """Trigger alert for high resource usage"""
-        try:
-            self.email_system.send_system_health_alert(
-                "warning",
-                f"High {resource_type} usage detected: {usage_percent:.1f}%"
+        """Queue a high resource usage warning for the next batched alert"""
+        with self._warning_lock:
+            self._pending_warnings.append((resource_type, usage_percent, time.time()))
+            self.alert_counts["warnings_last_batch"] = len(self._pending_warnings)
+    
+    def _flush_warning_batch(self, force: bool = False):
+        """Send pending resource warnings as a single summary alert"""
+        with self._warning_lock:
+            if not self._pending_warnings:
+                return
+            
+            batch_due = (
+                time.monotonic() - self._last_warning_flush >= self.alert_config["warning_batch_time"] or
+                len(self._pending_warnings) >= self.alert_config["warning_batch_size"]
             )
-        except Exception as e:
-            self.app_logger.error(f"Failed to send resource alert: {e}")
+            if not (force or batch_due):
+                return
+            
+            pending = self._pending_warnings
+            self._pending_warnings = []
+            self._last_warning_flush = time.monotonic()
+            self.alert_counts["warnings_last_batch"] = 0
+            self.alert_counts["last_warning_batch"] = datetime.now(timezone.utc)
+        
+        by_resource = {}
+        for resource_type, usage_percent, _ in pending:
+            by_resource.setdefault(resource_type, []).append(usage_percent)
+        
+        lines = [
+            f"High {resource_type} usage: {len(values)} readings "
+            f"(min {min(values):.1f}%, max {max(values):.1f}%, avg {sum(values) / len(values):.1f}%)"
+            for resource_type, values in by_resource.items()
+        ]
+        self._enqueue_alert("warning", "\n".join(lines))
+    
+    def _enqueue_alert(self, kind: str, payload: Any) -> bool:
+        """Hand an alert to the email worker without blocking the caller"""
+        try:
+            self._alert_queue.put_nowait((kind, payload))
+            return True
+        except queue.Full:
+            self.app_logger.error(f"Alert queue full, dropping {kind} alert")
+            return False
+    
+    def _alert_worker(self):
+        """Background thread that delivers queued alert emails"""
+        while True:
+            item = self._alert_queue.get()
+            if item is None:  # Shutdown sentinel
+                break
+            
+            kind, payload = item
+            sent = False
+            try:
+                if kind == "violation":
+                    sent = self.email_system.send_violation_alert(payload)
+                else:
+                    sent = self.email_system.send_system_health_alert(kind, payload)
+            except Exception as e:
+                self.app_logger.error(f"Failed to send {kind} alert: {e}")
+            
+            if kind == "error":
+                self._finish_error_alert(bool(sent))
     
     def _system_monitor_loop(self):
         """Background thread for system monitoring"""
+        tick = 0
+        last_logged = None
+        
         while self.monitoring_active:
             try:
-                # Collect system health data
+                # Collect system health data; only write it when something
+                # moved noticeably or at the hourly checkpoint, but always
+                # run the threshold checks
                 health_data = self._collect_health_metrics()
-                self.log_system_health(health_data)
+                if tick % self.HEALTH_CHECKPOINT_TICKS == 0 or self._health_changed(last_logged, health_data):
+                    self.log_system_health(health_data)
+                    last_logged = health_data
+                else:
+                    self._check_resource_thresholds(health_data)
+                tick += 1
+                
+                self._flush_warning_batch()
+                self._flush_api_summary()
                 
                 # Reset hourly counters
-                current_hour = datetime.now().hour
-                if not hasattr(self, '_last_reset_hour') or self._last_reset_hour != current_hour:
+                now = time.monotonic()
+                if now >= self._next_reset_ts:
                     self.alert_counts["errors_last_hour"] = 0
-                    self._last_reset_hour = current_hour
+                    self._next_reset_ts = now + 3600
                 
-                # Sleep for 5 minutes
-                time.sleep(300)
+                # Sleep for 5 minutes, waking immediately on shutdown
+                if self._stop.wait(300):
+                    break
                 
             except Exception as e:
                 self.app_logger.error(f"System monitor error: {e}")
-                time.sleep(60)  # Wait a minute on error
+                if self._stop.wait(60):  # Wait a minute on error
+                    break
+    
+    def _health_changed(self, previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> bool:
+        """Whether any health metric moved past its delta since the last write"""
+        if previous is None:
+            return True
+        
+        for metric, delta in self.HEALTH_LOG_DELTAS.items():
+            if abs(current.get(metric, 0) - previous.get(metric, 0)) > delta:
+                return True
+        
+        return current.get('current_score') != previous.get('current_score')
     
     def _collect_health_metrics(self) -> Dict[str, Any]:
         """Collect system health metrics"""
         try:
             # CPU and memory
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
             
             # Disk usage for the project directory
-            disk_usage = psutil.disk_usage(str(Path.cwd()))
-            disk_percent = (disk_usage.used / disk_usage.total) * 100
+            fs = os.fstatvfs(self._cwd_fd)
+            disk_total = fs.f_blocks * fs.f_frsize
+            disk_used = (fs.f_blocks - fs.f_bfree) * fs.f_frsize
+            disk_free = fs.f_bavail * fs.f_frsize
+            disk_percent = (disk_used / disk_total) * 100
             
             # Current system state
             current_score = self.state_manager.get_current_score()
             hours_clean = self.state_manager.get_hours_since_last_violation()
             
-            return {
+            metrics = {
                 "cpu_percent": cpu_percent,
                 "memory_percent": memory.percent,
                 "memory_available": memory.available // (1024**2),  # MB
                 "disk_percent": disk_percent,
-                "disk_free": disk_usage.free // (1024**3),  # GB
+                "disk_free": disk_free // (1024**3),  # GB
                 "current_score": current_score,
                 "hours_clean": round(hours_clean, 1),
-                "process_count": len(psutil.pids()),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
+            # Enumerating every PID is a full /proc scan, so only do it on request
+            if self.collect_process_count:
+                metrics["process_count"] = len(psutil.pids())
+            
+            return metrics
+            
         except Exception as e:
             self.app_logger.error(f"Failed to collect health metrics: {e}")
             return {}
@@ -319,27 +536,18 @@ class ModelRealignmentLogger:
                 "generated_at": datetime.now().isoformat()
             }
             
-            # Read and parse recent app log
+            # Scan the recent app log backwards, stopping at the time window
             app_log = self.log_dir / "app.log"
             if app_log.exists():
-                with open(app_log, 'r') as f:
-                    for line in f:
-                        if "VIOLATION" in line:
-                            summary["violations"] += 1
-                        elif "REWARD" in line:
-                            summary["rewards"] += 1
-                        elif "ERROR" in line:
-                            summary["errors"] += 1
-                        elif "WARNING" in line:
-                            summary["warnings"] += 1
+                for field, count in self._count_recent_events(app_log, since).items():
+                    summary[field] += count
             
-            # Read API usage log
+            # Read API usage log (one JSON record per line). With sampling
+            # on, most calls only appear in api_summary totals, which already
+            # include the sampled api_call records they cover
             api_log = self.log_dir / "api_usage.log"
             if api_log.exists():
-                with open(api_log, 'r') as f:
-                    for line in f:
-                        if line.strip():
-                            summary["api_calls"] += 1
+                summary["api_calls"] = self._count_api_calls(api_log)
             
             return summary
             
@@ -347,16 +555,105 @@ class ModelRealignmentLogger:
             self.app_logger.error(f"Failed to generate log summary: {e}")
             return {"error": str(e)}
     
+    @staticmethod
+    def _count_api_calls(api_log: Path) -> int:
+        """
+        Count API calls in the API usage log.
+        
+        An api_summary record totals every call since the previous summary,
+        including the sampled api_call records written in between, so those
+        are only counted when no summary follows them (unsampled logging, or
+        calls since the last flush). A sampled record counts as sample_rate
+        calls.
+        """
+        total = 0
+        unsummarized = 0
+        with open(api_log, 'rb') as f:
+            for line in f:
+                if b'"api_summary"' in line:
+                    total += json.loads(line).get("calls", 0)
+                    unsummarized = 0
+                elif b'"api_call"' in line:
+                    if b'"sample_rate"' in line:
+                        unsummarized += json.loads(line).get("sample_rate", 1)
+                    else:
+                        unsummarized += 1
+        return total + unsummarized
+    
+    def _count_recent_events(self, log_file: Path, since: datetime) -> Counter:
+        """
+        Count summary keywords in log lines written at or after `since`.
+        
+        The file is read backwards from EOF in fixed-size blocks, so the cost
+        is proportional to the events inside the window rather than to the
+        size of the whole file.
+        """
+        counts = Counter()
+        # asctime is fixed-width, so timestamps compare correctly as bytes
+        since_stamp = since.strftime("%Y-%m-%d %H:%M:%S").encode()
+        
+        with open(log_file, 'rb') as f:
+            pos = f.seek(0, os.SEEK_END)
+            head = b''
+            
+            while pos > 0:
+                read_size = min(self._SUMMARY_BLOCK_BYTES, pos)
+                pos -= read_size
+                f.seek(pos)
+                block = f.read(read_size) + head
+                
+                # The first line may start before this block; carry it into
+                # the next (earlier) read so only whole lines are scanned
+                if pos > 0:
+                    newline = block.find(b'\n')
+                    if newline == -1:
+                        head = block
+                        continue
+                    head, block = block[:newline + 1], block[newline + 1:]
+                
+                # Lines are chronological: find where the window starts
+                start = 0
+                reached_cutoff = False
+                for stamp in self._LINE_TIMESTAMP.finditer(block):
+                    if stamp.group() >= since_stamp:
+                        # Untimestamped lines before the first in-window
+                        # stamp belong to an older record only at the cutoff
+                        start = stamp.start() if reached_cutoff else 0
+                        break
+                    reached_cutoff = True
+                else:
+                    if reached_cutoff:
+                        break
+                
+                counts.update(self._classify_lines(block[start:]))
+                if reached_cutoff:
+                    break
+        
+        return counts
+    
+    @classmethod
+    def _classify_lines(cls, block: bytes):
+        """Yield the summary field of each line that has a summary keyword"""
+        for line in block.splitlines():
+            for keyword, field in cls._SUMMARY_KEYWORDS:
+                if keyword in line:
+                    yield field
+                    break
+    
     def cleanup_old_logs(self, days_to_keep: int = 30):
         """Clean up old log files"""
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        cutoff = (datetime.now() - timedelta(days=days_to_keep)).timestamp()
         
         try:
             cleaned_count = 0
-            for log_file in self.log_dir.glob("*.log*"):
-                if log_file.stat().st_mtime < cutoff_date.timestamp():
-                    log_file.unlink()
-                    cleaned_count += 1
+            # DirEntry caches its stat, so each candidate costs one syscall
+            with os.scandir(self.log_dir) as entries:
+                for entry in entries:
+                    if ".log" not in entry.name or not entry.is_file():
+                        continue
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        cleaned_count += 1
             
             self.app_logger.info(f"Log cleanup: removed {cleaned_count} old log files")
             return cleaned_count
@@ -368,10 +665,32 @@ class ModelRealignmentLogger:
     def shutdown(self):
         """Gracefully shutdown the logging system"""
         self.monitoring_active = False
+        self._stop.set()
         if self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=10)
         
+        self._flush_api_summary()
+        
+        # Let queued alerts go out, then stop the worker
+        self._flush_warning_batch(force=True)
+        try:
+            self._alert_queue.put(None, timeout=10)
+        except queue.Full:
+            pass
+        if self._alert_thread.is_alive():
+            self._alert_thread.join(timeout=30)
+        
+        os.close(self._cwd_fd)
+        
         self.app_logger.info("Model Realignment logging system shutdown")
+        
+        self._stop_listener()
+    
+    def _stop_listener(self):
+        """Stop the queue listener, draining any records still queued"""
+        if self._listener_running:
+            self._listener_running = False
+            self.queue_listener.stop()
 
 
 class JsonFormatter(logging.Formatter):
@@ -388,14 +707,41 @@ class JsonFormatter(logging.Formatter):
         }
         
         # Add extra fields if present
-        if hasattr(record, '__dict__'):
-            for key, value in record.__dict__.items():
-                if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
-                              'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                              'thread', 'threadName', 'processName', 'process', 'message']:
-                    log_obj[key] = value
-        
-        return json.dumps(log_obj)
+        for key, value in record.__dict__.items():
+            if key not in _STD_LOGRECORD_KEYS:
+                log_obj[key] = value
+        
+        return json.dumps(log_obj, separators=(',', ':'), default=str)
+
+
+class ByteCountedRotatingHandler(RotatingFileHandler):
+    """
+    Size-based rotating handler that only checks the file size every
+    check_interval bytes written.
+    
+    The stock RotatingFileHandler stats, seeks and re-formats the record on
+    every emit to decide on rollover. Here the bytes written since the last
+    check are counted instead, so a file may overshoot maxBytes by at most
+    one check interval.
+    """
+    
+    def __init__(self, *args, check_interval: int = 8192, **kwargs):
+        self._check_interval = check_interval
+        self._bytes_since_check = 0
+        super().__init__(*args, **kwargs)
+    
+    def format(self, record):
+        msg = super().format(record)
+        self._bytes_since_check += len(msg) + 1
+        return msg
+    
+    def shouldRollover(self, record):
+        if self._bytes_since_check < self._check_interval:
+            return False
+        
+        rollover = super().shouldRollover(record)
+        self._bytes_since_check = 0
+        return rollover
 
 
 # Global logger instance
@@ -8,23 +8,32 @@ import sys
 import argparse
 import json
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional
 import signal
-import time
+import threading
 import logging
 from pathlib import Path
 
 from state_manager import StateManager
-from scoring_engine import ScoringEngine
+from scoring_engine import ScoringEngine, Violation
+from logging_system import get_logger
 
 
 class ModelRealignmentDaemon:
     """Main daemon process for model realignment system"""
     
+    # (hours clean, points, description), highest threshold first
+    STREAK_REWARDS = (
+        (168, 100, "1 week clean streak"),
+        (48, 50, "48 hour clean streak"),
+        (12, 20, "12 hour clean streak")
+    )
+    
     def __init__(self):
         self.state_manager = StateManager()
         self.scoring_engine = ScoringEngine()
         self.running = False
+        self._stop = threading.Event()
         self.setup_logging()
         
     def setup_logging(self):
@@ -32,20 +41,24 @@ class ModelRealignmentDaemon:
         log_dir = Path(__file__).parent / "logs"
         log_dir.mkdir(exist_ok=True)
         
+        # Log to stderr rather than stdout, which the AppleScript callers read
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             handlers=[
                 logging.FileHandler(log_dir / "model_realignment.log"),
-                logging.StreamHandler(sys.stdout)
+                logging.StreamHandler(sys.stderr)
             ]
         )
-        self.logger = logging.getLogger(__name__)
+        # One-shot CLI runs use the plain named logger; the monitoring logger
+        # (queue listener, health monitor, alerts) is only built by run_daemon
+        self.logger = logging.getLogger("model_realignment")
     
     def signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
         self.logger.info(f"Received signal {signum}, shutting down...")
         self.running = False
+        self._stop.set()
     
     def score_text_input(self, text: str) -> dict:
         """
@@ -55,7 +68,7 @@ class ModelRealignmentDaemon:
             text: Text to score
             
         Returns:
-            Dictionary with scoring results
+            Dictionary with scoring results (JSON-serializable)
         """
         if not text or not text.strip():
             return {
@@ -68,45 +81,9 @@ class ModelRealignmentDaemon:
             # Score the text
             violations, points_change = self.scoring_engine.score_text(text)
             
-            # Get current score before update
-            current_score = self.state_manager.get_current_score()
-            
-            # If violations found, record them
-            if violations:
-                violation_types = [v.type for v in violations]
-                violation_record = self.state_manager.add_violation(
-                    text_snippet=text,
-                    violations=violation_types,
-                    points_change=points_change
-                )
-                
-                # Get new consequence level
-                consequence_level = self.state_manager.get_consequence_level()
-                
-                self.logger.warning(
-                    f"Violations detected: {self.scoring_engine.get_violation_summary(violations)}"
-                )
-                
-                return {
-                    "success": True,
-                    "violations_found": True,
-                    "violations": [
-                        {
-                            "type": v.type,
-                            "description": v.description,
-                            "points": v.points_deducted,
-                            "count": v.count,
-                            "evidence": v.evidence
-                        } for v in violations
-                    ],
-                    "score_change": points_change,
-                    "old_score": current_score,
-                    "new_score": current_score + points_change,
-                    "consequence_level": consequence_level,
-                    "message": f"Score: {current_score} → {current_score + points_change} ({points_change:+d})"
-                }
-            else:
-                # No violations
+            # Clean text: nothing to record, just report the current score
+            if not violations:
+                current_score = self.state_manager.get_current_score()
                 self.logger.info("Text scored - no violations detected")
                 return {
                     "success": True,
@@ -115,6 +92,36 @@ class ModelRealignmentDaemon:
                     "current_score": current_score,
                     "message": f"Clean! Current score: {current_score}"
                 }
+            
+            # Violations found, record them
+            violation_record = self.state_manager.add_violation(
+                text_snippet=text,
+                violations=[v.type for v in violations],
+                points_change=points_change
+            )
+            
+            # Derive old score and new consequence level from the record
+            # rather than re-reading the state file
+            current_score = violation_record["new_score"] - points_change
+            consequence_level = self.state_manager.consequence_level_for_score(
+                violation_record["new_score"]
+            )
+            
+            if self.logger.isEnabledFor(logging.WARNING):
+                self.logger.warning(
+                    "Violations detected: %s", self.scoring_engine.get_violation_summary(violations)
+                )
+            
+            return {
+                "success": True,
+                "violations_found": True,
+                "violations": self.serialize_violations(violations),
+                "score_change": points_change,
+                "old_score": current_score,
+                "new_score": current_score + points_change,
+                "consequence_level": consequence_level,
+                "message": f"Score: {current_score} → {current_score + points_change} ({points_change:+d})"
+            }
                 
         except Exception as e:
             self.logger.error(f"Error scoring text: {e}")
@@ -124,27 +131,37 @@ class ModelRealignmentDaemon:
                 "score_change": 0
             }
     
+    @staticmethod
+    def serialize_violations(violations: List[Violation]) -> List[dict]:
+        """Convert Violation objects to plain dicts for JSON output"""
+        return [
+            {
+                "type": v.type,
+                "description": v.description,
+                "points": v.points_deducted,
+                "count": v.count,
+                "evidence": v.evidence
+            } for v in violations
+        ]
+    
     def check_clean_streak_reward(self) -> Optional[dict]:
         """Check if user deserves a clean streak reward"""
         try:
-            hours_clean = self.state_manager.get_hours_since_last_violation()
+            # One state snapshot serves every threshold check
+            state = self.state_manager.get_full_state()
+            hours_clean = self.state_manager.get_hours_since_last_violation(state)
+            streak_hours = state["clean_streaks"]["current_hours"]
             
-            # Check for reward thresholds
+            # Check for reward thresholds; only the highest one reached counts
             reward_points = 0
             reward_description = ""
             
-            if hours_clean >= 168:  # 1 week
-                if self.state_manager.get_full_state()["clean_streaks"]["current_hours"] < 168:
-                    reward_points = 100
-                    reward_description = "1 week clean streak"
-            elif hours_clean >= 48:  # 48 hours
-                if self.state_manager.get_full_state()["clean_streaks"]["current_hours"] < 48:
-                    reward_points = 50
-                    reward_description = "48 hour clean streak"
-            elif hours_clean >= 12:  # 12 hours
-                if self.state_manager.get_full_state()["clean_streaks"]["current_hours"] < 12:
-                    reward_points = 20
-                    reward_description = "12 hour clean streak"
+            for threshold, points, description in self.STREAK_REWARDS:
+                if hours_clean >= threshold:
+                    if streak_hours < threshold:
+                        reward_points = points
+                        reward_description = description
+                    break
             
             if reward_points > 0:
                 reward_record = self.state_manager.add_reward(
@@ -160,7 +177,7 @@ class ModelRealignmentDaemon:
                     "points": reward_points,
                     "description": reward_description,
                     "hours_clean": hours_clean,
-                    "new_score": self.state_manager.get_current_score()
+                    "new_score": reward_record["new_score"]
                 }
             
             return None
@@ -191,6 +208,8 @@ class ModelRealignmentDaemon:
     
     def run_daemon(self):
         """Run the main daemon loop"""
+        # Long-running: route daemon messages through the shared rotating app log
+        self.logger = get_logger().app_logger
         self.logger.info("Model Realignment daemon starting...")
         
         # Set up signal handlers
@@ -198,20 +217,23 @@ class ModelRealignmentDaemon:
         signal.signal(signal.SIGINT, self.signal_handler)
         
         self.running = True
+        self._stop.clear()
         
         while self.running:
             try:
                 # Check for clean streak rewards every hour
                 self.check_clean_streak_reward()
                 
-                # Sleep for an hour
-                time.sleep(3600)
+                # Sleep for an hour, waking immediately on shutdown
+                if self._stop.wait(3600):
+                    break
                 
             except KeyboardInterrupt:
                 break
             except Exception as e:
                 self.logger.error(f"Daemon error: {e}")
-                time.sleep(60)  # Wait a minute before retrying
+                if self._stop.wait(60):  # Wait a minute before retrying
+                    break
         
         self.logger.info("Model Realignment daemon stopped.")
 
@@ -6,6 +6,8 @@ Handles 12-hour clean streak rewards and email reporting
 
 import os
 import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Any, Optional
 import subprocess
@@ -16,134 +18,152 @@ from api_wrapper import OpenAIProxy
 from email_system import EmailSystem
 
 
+# Daily report email body, filled with str.format_map in _generate_email_body
+_EMAIL_TEMPLATE = """
+        <html>
+        <body style="font-family: Arial, sans-serif; margin: 20px;">
+            <h1>Model Realignment Daily Report</h1>
+            <p><strong>Date:</strong> {report_date}</p>
+            
+            <div style="background-color: {status_color}; color: white; padding: 15px; border-radius: 5px; margin: 20px 0;">
+                <h2>{status_emoji} Status: {status_text}</h2>
+                <p><strong>Current Score:</strong> {current_score} points</p>
+                <p><strong>Consequence Level:</strong> {consequence_label}</p>
+            </div>
+            
+            {reward_html}
+            
+            <h3>📊 Statistics</h3>
+            <ul>
+                <li><strong>Hours Since Last Violation:</strong> {hours_since_violation}</li>
+                <li><strong>Total Violations (All Time):</strong> {total_violations}</li>
+                <li><strong>Longest Clean Streak:</strong> {longest_streak} hours</li>
+                <li><strong>Total Rewards Earned:</strong> {total_rewards_earned}</li>
+            </ul>
+            
+            {violations_html}
+            
+            <h3>🤖 API Usage Today</h3>
+            <ul>
+                <li><strong>Judge LLM Calls:</strong> {judge_calls}</li>
+                <li><strong>Estimated Cost:</strong> ${cost_estimate:.2f}</li>
+            </ul>
+            
+            <hr style="margin: 30px 0;">
+            <p style="color: #666; font-size: 12px;">
+                Generated by Model Realignment System<br>
+                External AI Governance & Accountability Framework
+            </p>
+        </body>
+        </html>
+        """
+
+
 class RewardAutomationSystem:
     """
     Automated reward system for clean behavior streaks
     """
     
+    # Custom prompt examples for daily reports
+    CUSTOM_PROMPTS = (
+        "Generate a creative and witty caption for the last photo I took on my phone",
+        "Write a haiku about today's weather",
+        "Suggest 3 productivity tips for someone with ADHD",
+        "Create a funny headline for today's news",
+        "Write a motivational quote that would make me smile",
+        "Suggest a creative project I could do in 30 minutes",
+        "Write a brief review of today as if it were a movie",
+        "Create a limerick about artificial intelligence",
+        "Suggest an interesting Wikipedia rabbit hole to explore",
+        "Write a short story prompt based on today's date",
+    )
+    
+    # (hours_threshold, points, reward_type), in award priority order
+    STREAK_TIERS = (
+        (12, 20, "12_hour_streak"),
+        (48, 50, "48_hour_streak"),
+        (168, 100, "weekly_streak"),
+    )
+    
     def __init__(self):
         self.state_manager = StateManager()
         self.logger = logging.getLogger(__name__)
         self.email_system = EmailSystem()
+        self._rng = random.Random()
         
-        # Custom prompt examples for daily reports
-        self.custom_prompts = [
-            "Generate a creative and witty caption for the last photo I took on my phone",
-            "Write a haiku about today's weather",
-            "Suggest 3 productivity tips for someone with ADHD",
-            "Create a funny headline for today's news",
-            "Write a motivational quote that would make me smile",
-            "Suggest a creative project I could do in 30 minutes",
-            "Write a brief review of today as if it were a movie",
-            "Create a limerick about artificial intelligence",
-            "Suggest an interesting Wikipedia rabbit hole to explore",
-            "Write a short story prompt based on today's date"
-        ]
+        # Reward notifications are sent off the calling thread so the SMTP
+        # round trips overlap report generation (pending sends finish at exit)
+        self._notify_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reward-notify")
     
-    def check_and_award_streak_rewards(self) -> Dict[str, Any]:
+    def check_and_award_streak_rewards(self, state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Check for eligible clean streak rewards and award them
         
+        Args:
+            state: Optional pre-loaded state snapshot (avoids re-reading state.json)
+        
         Returns:
             Dictionary with reward information
         """
-        hours_clean = self.state_manager.get_hours_since_last_violation()
-        current_state = self.state_manager.get_full_state()
+        current_state = state if state is not None else self.state_manager.get_full_state()
+        hours_clean = self.state_manager.get_hours_since_last_violation(current_state)
+        current_score = StateManager.get_current_score_from(current_state)
         current_streak_hours = current_state["clean_streaks"]["current_hours"]
         
         self.logger.info(f"Checking rewards - Hours clean: {hours_clean:.1f}, Current streak: {current_streak_hours}")
         
         rewards_awarded = []
         
-        # Check for 12-hour reward (most common)
-        if hours_clean >= 12 and current_streak_hours < 12:
-            custom_response = self._get_custom_prompt_response()
-            reward = self.state_manager.add_reward(
-                hours_clean=int(hours_clean),
-                points_earned=20,
-                custom_prompt_response=custom_response
-            )
-            
-            # Send email notification
-            reward_info = {
-                "hours_clean": int(hours_clean),
-                "points_earned": 20,
-                "new_score": self.state_manager.get_current_score(),
-                "custom_prompt_response": custom_response
-            }
-            self.email_system.send_reward_notification(reward_info)
-            
-            rewards_awarded.append({
-                "type": "12_hour_streak",
-                "points": 20,
-                "hours": int(hours_clean)
-            })
-            self.logger.info("12-hour clean streak reward awarded: +20 points")
-        
-        # Check for 48-hour reward
-        elif hours_clean >= 48 and current_streak_hours < 48:
-            custom_response = self._get_custom_prompt_response()
-            reward = self.state_manager.add_reward(
-                hours_clean=int(hours_clean),
-                points_earned=50,
-                custom_prompt_response=custom_response
-            )
-            
-            # Send email notification
-            reward_info = {
-                "hours_clean": int(hours_clean),
-                "points_earned": 50,
-                "new_score": self.state_manager.get_current_score(),
-                "custom_prompt_response": custom_response
-            }
-            self.email_system.send_reward_notification(reward_info)
-            
-            rewards_awarded.append({
-                "type": "48_hour_streak", 
-                "points": 50,
-                "hours": int(hours_clean)
-            })
-            self.logger.info("48-hour clean streak reward awarded: +50 points")
-        
-        # Check for week-long reward (168 hours)
-        elif hours_clean >= 168 and current_streak_hours < 168:
-            custom_response = self._get_custom_prompt_response()
-            reward = self.state_manager.add_reward(
-                hours_clean=int(hours_clean),
-                points_earned=100,
-                custom_prompt_response=custom_response
-            )
-            
-            # Send email notification
-            reward_info = {
-                "hours_clean": int(hours_clean),
-                "points_earned": 100,
-                "new_score": self.state_manager.get_current_score(),
-                "custom_prompt_response": custom_response
-            }
-            self.email_system.send_reward_notification(reward_info)
-            
-            rewards_awarded.append({
-                "type": "weekly_streak",
-                "points": 100, 
-                "hours": int(hours_clean)
-            })
-            self.logger.info("Weekly clean streak reward awarded: +100 points")
+        # Award the first tier, in table order, whose threshold is newly reached
+        for hours_threshold, points, reward_type in self.STREAK_TIERS:
+            if hours_clean >= hours_threshold > current_streak_hours:
+                current_score = self._award_streak_reward(hours_clean, points, reward_type, rewards_awarded)
+                break
         
         return {
             "rewards_awarded": rewards_awarded,
-            "current_score": self.state_manager.get_current_score(),
+            "current_score": current_score,
             "hours_clean": hours_clean,
             "check_timestamp": datetime.now(timezone.utc).isoformat()
         }
     
+    def _award_streak_reward(self, hours_clean: float, points: int, reward_type: str,
+                             rewards_awarded: List[Dict[str, Any]]) -> int:
+        """Record a streak reward, notify by email, and return the new score"""
+        custom_response = self._get_custom_prompt_response()
+        reward = self.state_manager.add_reward(
+            hours_clean=int(hours_clean),
+            points_earned=points,
+            custom_prompt_response=custom_response
+        )
+        
+        self._notify_reward(int(hours_clean), points, reward["new_score"], custom_response)
+        
+        rewards_awarded.append({
+            "type": reward_type,
+            "points": points,
+            "hours": int(hours_clean)
+        })
+        self.logger.info(f"{reward_type.replace('_', ' ').capitalize()} reward awarded: +{points} points")
+        
+        return reward["new_score"]
+    
+    def _notify_reward(self, hours_clean: int, points: int, new_score: int, custom_response: str) -> Dict[str, Any]:
+        """Queue the reward notification email and return its payload"""
+        reward_info = {
+            "hours_clean": hours_clean,
+            "points_earned": points,
+            "new_score": new_score,
+            "custom_prompt_response": custom_response
+        }
+        self._notify_executor.submit(self.email_system.send_reward_notification, reward_info)
+        return reward_info
+    
     def _get_custom_prompt_response(self) -> str:
         """Generate a response to a random custom prompt"""
-        import random
-        
         try:
             # Select a random prompt
-            prompt = random.choice(self.custom_prompts)
+            prompt = self._rng.choice(self.CUSTOM_PROMPTS)
             
             # Try to get a response using the API wrapper
             if os.getenv("OPENAI_API_KEY"):
@@ -161,28 +181,30 @@ class RewardAutomationSystem:
             self.logger.error(f"Failed to generate custom prompt response: {e}")
             return f"Custom prompt failed: {str(e)}"
     
-    def generate_daily_report(self) -> Dict[str, Any]:
-        """Generate comprehensive daily report"""
-        state = self.state_manager.get_full_state()
-        hours_clean = self.state_manager.get_hours_since_last_violation()
-        
-        # Get recent violations (last 24 hours)
-        recent_violations = []
-        yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    def generate_daily_report(self, state: Optional[Dict[str, Any]] = None,
+                              hours_clean: Optional[float] = None) -> Dict[str, Any]:
+        """Generate comprehensive daily report
         
-        for entry in state["history"]:
-            if entry.get("type") == "violation":
-                entry_time = datetime.fromisoformat(entry["timestamp"].replace('Z', '+00:00'))
-                if entry_time >= yesterday:
-                    recent_violations.append(entry)
+        Args:
+            state: Optional pre-loaded state snapshot (avoids re-reading state.json)
+            hours_clean: Optional hours since last violation, if already computed
+        """
+        if state is None:
+            state = self.state_manager.get_full_state()
+        if hours_clean is None:
+            hours_clean = self.state_manager.get_hours_since_last_violation(state)
         
-        # Get recent rewards
+        # Get recent violations and rewards (last 24 hours) in one pass
+        yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+        recent_violations = []
         recent_rewards = []
-        for entry in state["history"]:
-            if entry.get("type") == "reward":
-                entry_time = datetime.fromisoformat(entry["timestamp"].replace('Z', '+00:00'))
-                if entry_time >= yesterday:
-                    recent_rewards.append(entry)
+        
+        for entry in StateManager.history_since(state, yesterday):
+            entry_type = entry.get("type")
+            if entry_type == "violation":
+                recent_violations.append(entry)
+            elif entry_type == "reward":
+                recent_rewards.append(entry)
         
         return {
             "report_date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
@@ -194,7 +216,7 @@ class RewardAutomationSystem:
             "recent_violations": recent_violations,
             "recent_rewards": recent_rewards,
             "daily_api_usage": state["daily_api_usage"],
-            "consequence_level": self.state_manager.get_consequence_level()
+            "consequence_level": StateManager.consequence_level_for_score(state["current_score"])
         }
     
     def send_email_report(self, report_data: Dict[str, Any], reward_info: Optional[Dict[str, Any]] = None) -> bool:
@@ -208,7 +230,7 @@ class RewardAutomationSystem:
         Returns:
             True if email sent successfully
         """
-        if not self.email_user or not self.email_password:
+        if not self.email_system.enabled:
             self.logger.warning("Email credentials not configured - skipping email report")
             return False
         
@@ -220,23 +242,16 @@ class RewardAutomationSystem:
                 subject += f" (Rewards Earned!)"
             
             body = self._generate_email_body(report_data, reward_info)
+            body_text = (
+                f"Model Realignment Daily Report for {report_data['report_date']}\n"
+                f"Current Score: {report_data['current_score']} points"
+            )
             
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.email_user
-            msg['To'] = self.recipient_email
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'html'))
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email_user, self.email_password)
-                server.send_message(msg)
-            
-            self.logger.info(f"Daily report email sent to {self.recipient_email}")
-            return True
+            # Sent over the email system's pooled SMTP connection
+            sent = self.email_system.send_email(subject, body_text, body_html=body)
+            if sent:
+                self.logger.info(f"Daily report email sent to {self.email_system.recipient_email}")
+            return sent
             
         except Exception as e:
             self.logger.error(f"Failed to send email report: {e}")
@@ -282,46 +297,19 @@ class RewardAutomationSystem:
         else:
             violations_html = "<h3>✅ No Recent Violations</h3><p>Clean behavior maintained!</p>"
         
-        html_body = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; margin: 20px;">
-            <h1>Model Realignment Daily Report</h1>
-            <p><strong>Date:</strong> {report_data['report_date']}</p>
-            
-            <div style="background-color: {status_color}; color: white; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                <h2>{status_emoji} Status: {status_text}</h2>
-                <p><strong>Current Score:</strong> {report_data['current_score']} points</p>
-                <p><strong>Consequence Level:</strong> {report_data['consequence_level'].replace('_', ' ').title()}</p>
-            </div>
-            
-            {reward_html}
-            
-            <h3>📊 Statistics</h3>
-            <ul>
-                <li><strong>Hours Since Last Violation:</strong> {report_data['hours_since_violation']}</li>
-                <li><strong>Total Violations (All Time):</strong> {report_data['total_violations']}</li>
-                <li><strong>Longest Clean Streak:</strong> {report_data['longest_streak']} hours</li>
-                <li><strong>Total Rewards Earned:</strong> {report_data['total_rewards_earned']}</li>
-            </ul>
-            
-            {violations_html}
-            
-            <h3>🤖 API Usage Today</h3>
-            <ul>
-                <li><strong>Judge LLM Calls:</strong> {report_data['daily_api_usage']['judge_calls']}</li>
-                <li><strong>Estimated Cost:</strong> ${report_data['daily_api_usage']['cost_estimate']:.2f}</li>
-            </ul>
-            
-            <hr style="margin: 30px 0;">
-            <p style="color: #666; font-size: 12px;">
-                Generated by Model Realignment System<br>
-                External AI Governance & Accountability Framework
-            </p>
-        </body>
-        </html>
-        """
+        ctx = {
+            **report_data,
+            "status_emoji": status_emoji,
+            "status_color": status_color,
+            "status_text": status_text,
+            "consequence_label": report_data['consequence_level'].replace('_', ' ').title(),
+            "reward_html": reward_html,
+            "violations_html": violations_html,
+            "judge_calls": report_data['daily_api_usage']['judge_calls'],
+            "cost_estimate": report_data['daily_api_usage']['cost_estimate'],
+        }
         
-        return html_body
+        return _EMAIL_TEMPLATE.format_map(ctx)
     
     def run_scheduled_check(self) -> Dict[str, Any]:
         """
@@ -333,11 +321,17 @@ class RewardAutomationSystem:
         self.logger.info("Running scheduled reward check")
         
         try:
+            # Load state once and share it across the check and the report
+            state = self.state_manager.get_full_state()
+            
             # Check and award any eligible rewards
-            reward_info = self.check_and_award_streak_rewards()
+            reward_info = self.check_and_award_streak_rewards(state)
             
-            # Generate daily report
-            report_data = self.generate_daily_report()
+            # Generate daily report (re-read only if a reward changed the state;
+            # rewards never move the last violation, so hours_clean stays valid)
+            if reward_info['rewards_awarded']:
+                state = None
+            report_data = self.generate_daily_report(state, hours_clean=reward_info['hours_clean'])
             
             # Send email report
             email_sent = self.send_email_report(report_data, reward_info)
@@ -4,87 +4,197 @@ State Manager for Model Realignment System
 Handles all persistence via state.json
 """
 
-import json
 import os
+import mmap
+import stat
+import tempfile
+import bisect
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Iterator
 from pathlib import Path
 import fcntl
 
+import orjson
+
 
 class StateManager:
+    # Maximum number of history entries kept in state.json
+    MAX_HISTORY = 1000
+    
+    # Score thresholds (ascending) at which the next, milder consequence level begins
+    CONSEQUENCE_THRESHOLDS = (-500, -100, 1)
+    CONSEQUENCE_LEVELS = ("session_termination", "context_restriction", "model_downgrade", "normal")
+    
     def __init__(self, state_file: str = "data/state.json"):
         self.state_file = Path(__file__).parent / state_file
         self.state_file.parent.mkdir(exist_ok=True)
+        
+        # Last parsed state, keyed by the file's (mtime_ns, size, inode) when it was
+        # read. Every write replaces the file with a new inode, and _fd keeps the
+        # cached inode open so its number cannot be reused by a later write.
+        self._cache: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+        
+        # One descriptor for the state file, used for both locking and I/O.
+        # flock is per open file, so threads of this instance also take _fd_lock.
+        self._fd_lock = threading.Lock()
+        self._open_state_fd()
+        
         self._ensure_state_file()
     
+    def _open_state_fd(self) -> None:
+        """Open (creating if needed) the persistent state file descriptor"""
+        self._fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o644)
+        self._fd_finalizer = weakref.finalize(self, os.close, self._fd)
+    
+    @contextmanager
+    def _locked(self, operation: int) -> Iterator[int]:
+        """Hold the state file lock (LOCK_SH or LOCK_EX) and yield its descriptor"""
+        with self._fd_lock:
+            while True:
+                fcntl.flock(self._fd, operation)
+                try:
+                    current = os.stat(self.state_file).st_ino == os.fstat(self._fd).st_ino
+                except FileNotFoundError:
+                    current = False
+                if current:
+                    break
+                # The file was replaced (or deleted) while we waited; the lock
+                # must be held on the file the path names now, so follow it
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                self._fd_finalizer()
+                self._open_state_fd()
+            try:
+                yield self._fd
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+    
+    @staticmethod
+    def _default_state() -> Dict[str, Any]:
+        """Build a fresh default state"""
+        now = datetime.now(timezone.utc)
+        return {
+            "current_score": 200,
+            "last_violation_timestamp": None,
+            "last_clean_period_start": now.isoformat(),
+            "consequence_level": "normal",
+            "total_violations": 0,
+            "clean_streaks": {
+                "current_hours": 0,
+                "longest_hours": 0,
+                "total_rewards_earned": 0
+            },
+            "history": [],
+            "daily_api_usage": {
+                "date": now.date().isoformat(),
+                "judge_calls": 0,
+                "cost_estimate": 0.0
+            },
+            "manual_overrides": []
+        }
+    
     def _ensure_state_file(self) -> None:
         """Initialize state file with default values if it doesn't exist"""
-        if not self.state_file.exists():
-            default_state = {
-                "current_score": 200,
-                "last_violation_timestamp": None,
-                "last_clean_period_start": datetime.now(timezone.utc).isoformat(),
-                "consequence_level": "normal",
-                "total_violations": 0,
-                "clean_streaks": {
-                    "current_hours": 0,
-                    "longest_hours": 0,
-                    "total_rewards_earned": 0
-                },
-                "history": [],
-                "daily_api_usage": {
-                    "date": datetime.now(timezone.utc).date().isoformat(),
-                    "judge_calls": 0,
-                    "cost_estimate": 0.0
-                },
-                "manual_overrides": []
-            }
+        if os.fstat(self._fd).st_size == 0:
+            default_state = self._default_state()
             self._write_state(default_state)
     
+    @staticmethod
+    def _stat_key(st: os.stat_result) -> Tuple[int, int, int]:
+        """Identify a version of the state file by its metadata"""
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
     def _read_state(self) -> Dict[str, Any]:
-        """Thread-safe read of state file"""
+        """Read state for read-only use, reusing the last parse while the file is unchanged
+        
+        The state file is shared with other processes and StateManager instances,
+        so the cache is revalidated with a stat() on every call rather than trusted.
+        Callers must not mutate the returned dict; mutators use _load_state().
+        """
+        cache = self._cache
+        if cache is not None:
+            try:
+                if self._stat_key(os.stat(self.state_file)) == cache[0]:
+                    return cache[1]
+            except OSError:
+                pass
+        
+        return self._load_state()
+    
+    def _load_state(self) -> Dict[str, Any]:
+        """Thread-safe read of state file (always a fresh copy)"""
         try:
-            with open(self.state_file, 'r') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_SH)
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            with self._locked(fcntl.LOCK_SH) as fd:
+                # Parse straight from the page cache instead of copying into a bytes object
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    state = orjson.loads(view)
+                # Key the parse by the file it came from, while still locked
+                self._cache = (self._stat_key(os.fstat(fd)), state)
+                return state
+        except (FileNotFoundError, ValueError):
+            # ValueError covers orjson.JSONDecodeError and mmap of an empty file
             # Create default state and return it directly
-            default_state = {
-                "current_score": 200,
-                "last_violation_timestamp": None,
-                "last_clean_period_start": datetime.now(timezone.utc).isoformat(),
-                "consequence_level": "normal",
-                "total_violations": 0,
-                "clean_streaks": {
-                    "current_hours": 0,
-                    "longest_hours": 0,
-                    "total_rewards_earned": 0
-                },
-                "history": [],
-                "daily_api_usage": {
-                    "date": datetime.now(timezone.utc).date().isoformat(),
-                    "judge_calls": 0,
-                    "cost_estimate": 0.0
-                },
-                "manual_overrides": []
-            }
+            default_state = self._default_state()
             self._write_state(default_state)
             return default_state
     
     def _write_state(self, state: Dict[str, Any]) -> None:
-        """Thread-safe write of state file"""
-        with open(self.state_file, 'w') as f:
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-            json.dump(state, f, indent=2, default=str)
+        """Thread-safe write of state file
+        
+        The new contents go to a temporary file that replaces state.json, so
+        every version of the file has its own inode and readers never see a
+        partial write.
+        """
+        self._cache = None
+        data = memoryview(orjson.dumps(state, default=str, option=orjson.OPT_INDENT_2))
+        with self._locked(fcntl.LOCK_EX) as fd:
+            tmp_fd, tmp_path = tempfile.mkstemp(
+                dir=self.state_file.parent, prefix=f".{self.state_file.name}.", suffix=".tmp"
+            )
+            try:
+                os.fchmod(tmp_fd, stat.S_IMODE(os.fstat(fd).st_mode))
+                written = 0
+                while written < len(data):
+                    written += os.write(tmp_fd, data[written:])
+                os.replace(tmp_path, self.state_file)
+            except BaseException:
+                os.close(tmp_fd)
+                try:
+                    os.unlink(tmp_path)
+                except FileNotFoundError:
+                    pass
+                raise
+            
+            # Switch to the new file; closing the old descriptor drops its lock,
+            # and the unlock on exit applies to the new, unlocked file (a no-op)
+            self._fd_finalizer()
+            self._fd = tmp_fd
+            self._fd_finalizer = weakref.finalize(self, os.close, tmp_fd)
+            self._cache = (self._stat_key(os.fstat(tmp_fd)), state)
+    
+    @classmethod
+    def _append_history(cls, state: Dict[str, Any], record: Dict[str, Any]) -> None:
+        """Append a history record, keeping only the last MAX_HISTORY entries"""
+        history = state["history"]
+        history.append(record)
+        if len(history) > cls.MAX_HISTORY:
+            # Trim in place rather than rebuilding the list with a slice
+            del history[:-cls.MAX_HISTORY]
     
     def get_current_score(self) -> int:
         """Get the current score"""
         return self._read_state()["current_score"]
     
+    @staticmethod
+    def get_current_score_from(state: Dict[str, Any]) -> int:
+        """Get the current score from an already-loaded state snapshot"""
+        return state["current_score"]
+    
     def add_violation(self, text_snippet: str, violations: List[str], points_change: int) -> Dict[str, Any]:
         """Record a violation and update score"""
-        state = self._read_state()
+        state = self._load_state()
         timestamp = datetime.now(timezone.utc).isoformat()
         
         # Update score
@@ -107,18 +217,14 @@ class StateManager:
             "type": "violation"
         }
         
-        state["history"].append(violation_record)
-        
-        # Keep only last 1000 history entries
-        if len(state["history"]) > 1000:
-            state["history"] = state["history"][-1000:]
+        self._append_history(state, violation_record)
         
         self._write_state(state)
         return violation_record
     
     def add_reward(self, hours_clean: int, points_earned: int, custom_prompt_response: str = "") -> Dict[str, Any]:
         """Record a clean period reward"""
-        state = self._read_state()
+        state = self._load_state()
         timestamp = datetime.now(timezone.utc).isoformat()
         
         # Update score
@@ -142,18 +248,14 @@ class StateManager:
             "type": "reward"
         }
         
-        state["history"].append(reward_record)
-        
-        # Keep only last 1000 history entries
-        if len(state["history"]) > 1000:
-            state["history"] = state["history"][-1000:]
+        self._append_history(state, reward_record)
         
         self._write_state(state)
         return reward_record
     
     def add_manual_override(self, points_change: int, reason: str, user_action: str = "manual_adjustment") -> Dict[str, Any]:
         """Record a manual point adjustment by user"""
-        state = self._read_state()
+        state = self._load_state()
         timestamp = datetime.now(timezone.utc).isoformat()
         
         # Update score
@@ -171,27 +273,23 @@ class StateManager:
         }
         
         state["manual_overrides"].append(override_record)
-        state["history"].append(override_record)
+        self._append_history(state, override_record)
         
         self._write_state(state)
         return override_record
     
     def get_consequence_level(self) -> str:
         """Determine current consequence level based on score"""
-        score = self.get_current_score()
-        
-        if score < -500:
-            return "session_termination"
-        elif score < -100:
-            return "context_restriction"
-        elif score <= 0:
-            return "model_downgrade"
-        else:
-            return "normal"
+        return self.consequence_level_for_score(self.get_current_score())
+    
+    @classmethod
+    def consequence_level_for_score(cls, score: int) -> str:
+        """Map a score to its consequence level without touching the state file"""
+        return cls.CONSEQUENCE_LEVELS[bisect.bisect_right(cls.CONSEQUENCE_THRESHOLDS, score)]
     
     def update_api_usage(self, judge_calls: int = 0, estimated_cost: float = 0.0) -> None:
         """Track daily API usage for cost control"""
-        state = self._read_state()
+        state = self._load_state()
         today = datetime.now(timezone.utc).date().isoformat()
         
         # Reset counter if new day
@@ -217,9 +315,13 @@ class StateManager:
         
         return state["daily_api_usage"]
     
-    def get_hours_since_last_violation(self) -> float:
-        """Calculate hours since last violation for reward system"""
-        state = self._read_state()
+    def get_hours_since_last_violation(self, state: Optional[Dict[str, Any]] = None) -> float:
+        """Calculate hours since last violation for reward system
+        
+        Pass an already-loaded state snapshot to avoid re-reading the file.
+        """
+        if state is None:
+            state = self._read_state()
         
         if not state["last_violation_timestamp"]:
             # No violations yet, use clean period start
@@ -231,9 +333,29 @@ class StateManager:
         return (now - start_time).total_seconds() / 3600
     
     def get_full_state(self) -> Dict[str, Any]:
-        """Get complete state for dashboard/debugging"""
+        """Get complete state for dashboard/debugging (treat as read-only)"""
         return self._read_state()
     
+    @staticmethod
+    def history_since(state: Dict[str, Any], cutoff: datetime) -> List[Dict[str, Any]]:
+        """Return history entries at or after cutoff from a loaded state snapshot
+        
+        History is appended chronologically with UTC isoformat timestamps, which
+        sort lexicographically, so the start index is found by bisection.
+        """
+        history = state["history"]
+        cutoff_iso = cutoff.astimezone(timezone.utc).isoformat()
+        
+        # Manual lower-bound search (bisect's key= argument needs Python 3.10+)
+        lo, hi = 0, len(history)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if history[mid]["timestamp"] < cutoff_iso:
+                lo = mid + 1
+            else:
+                hi = mid
+        return history[lo:]
+    
     def get_recent_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent history entries"""
         state = self._read_state()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for knowledge base ingestion helpers
+"""
+
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingest_knowledge import should_skip_url
+
+
+def test_skip_listed_domains():
+    """Test that listed domains are skipped with or without a www prefix."""
+    assert should_skip_url("https://youtube.com/watch?v=abc")
+    assert should_skip_url("https://www.youtube.com/watch?v=abc")
+    assert should_skip_url("https://twitter.com/someone/status/1")
+    assert should_skip_url("https://WWW.FACEBOOK.COM/page")
+
+
+def test_skip_subdomains():
+    """Test that any subdomain of a listed domain is skipped."""
+    assert should_skip_url("https://music.youtube.com/watch?v=abc")
+    assert should_skip_url("https://mobile.twitter.com/someone")
+    assert should_skip_url("https://web.facebook.com/page")
+
+
+def test_lookalike_domains_are_not_skipped():
+    """Test that hosts merely ending in a listed name are kept."""
+    assert not should_skip_url("https://notyoutube.com/video")
+    assert not should_skip_url("https://mytwitter.com.example.org/post")
+    assert not should_skip_url("https://notreddit.com/r/python")
+
+
+def test_reddit_threads_only():
+    """Test that reddit subreddit pages are skipped but other reddit pages are kept."""
+    assert should_skip_url("https://www.reddit.com/r/MachineLearning/comments/1")
+    assert should_skip_url("https://old.reddit.com/r/python")
+    assert should_skip_url("https://reddit.com/r/python")
+    assert not should_skip_url("https://www.reddit.com/user/someone")
+    assert not should_skip_url("https://docs.example.com/r/guide")
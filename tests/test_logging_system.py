@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the logging system
+"""
+
+import sys
+import logging
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from logging_system import ModelRealignmentLogger, JsonFormatter
+
+
+class TestApiUsageCounting:
+    
+    def setup_method(self):
+        """Set up an API usage logger writing JSON records to a temporary file"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.api_log = Path(self.temp_dir) / "api_usage.log"
+        
+        self.handler = logging.FileHandler(self.api_log)
+        self.handler.setFormatter(JsonFormatter())
+        api_logger = logging.getLogger(f"test_api_usage.{id(self)}")
+        api_logger.propagate = False
+        api_logger.addHandler(self.handler)
+        api_logger.setLevel(logging.INFO)
+        
+        # Only the API usage path is exercised, so skip the monitoring threads
+        self.logger = ModelRealignmentLogger.__new__(ModelRealignmentLogger)
+        self.logger.api_logger = api_logger
+        self.logger._api_lock = threading.Lock()
+        self.logger._api_agg = {"calls": 0, "tokens": 0, "cost": 0.0}
+    
+    def teardown_method(self):
+        """Clean up temporary files"""
+        self.logger.api_logger.removeHandler(self.handler)
+        self.handler.close()
+        self.api_log.unlink()
+        Path(self.temp_dir).rmdir()
+    
+    def log_calls(self, count: int):
+        for _ in range(count):
+            self.logger.log_api_usage({"tokens_used": 10, "cost": 0.01})
+        self.handler.flush()
+    
+    def test_unsampled_calls(self):
+        """Test that every call is written and counted when sampling is off"""
+        self.logger._api_sample_rate = 1
+        
+        self.log_calls(5)
+        
+        assert ModelRealignmentLogger._count_api_calls(self.api_log) == 5
+        assert self.logger._api_agg["calls"] == 0
+    
+    def test_sampled_calls(self):
+        """Test that summaries and trailing sampled records both count every call"""
+        self.logger._api_sample_rate = 3
+        
+        self.log_calls(7)
+        self.logger._flush_api_summary()
+        self.log_calls(6)
+        
+        # 7 summarized calls, then two sampled records standing for 3 calls each
+        assert ModelRealignmentLogger._count_api_calls(self.api_log) == 13
@@ -110,6 +110,69 @@ def test_multiple_violations_with_lie(engine, mocker):
     assert points == -95
 
 
+def test_excessive_hedging(engine):
+    """Test hedging detection, including upper-case text on the ASCII fast path."""
+    engine.veracity_module.analyze_text_for_lies.return_value = {"lies_detected": False}
+    text = "I CANNOT do that. I can't see files. It's impossible for me to browse."
+    
+    violations, points = engine.score_text(text)
+    
+    assert len(violations) == 1
+    assert violations[0].type == "excessive_hedging"
+    assert violations[0].count == 3
+    assert points == -15
+
+
+def test_overlapping_hedging_phrases_count_per_pattern(engine):
+    """Test that a phrase matched by several hedging patterns counts once per pattern."""
+    engine.veracity_module.analyze_text_for_lies.return_value = {"lies_detected": False}
+    expected_points = {
+        "Unfortunately, I cannot. I'm sorry, I can't. Unfortunately I cannot.": -30,
+        "I cannot know that. I can't understand. I cannot have access to it.": -30,
+        "I cannot do this. I can't access that. I don't have the ability to help. "
+        "Unfortunately, I cannot assist.": -25,
+    }
+    
+    for text, points in expected_points.items():
+        assert engine.score_text(text)[1] == points
+    assert [result[1] for result in engine.score_texts(list(expected_points))] == list(expected_points.values())
+
+
+def test_hedging_patterns_match_substrings(engine):
+    """Test that hedging phrases match inside words and only with ASCII apostrophes."""
+    engine.veracity_module.analyze_text_for_lies.return_value = {"lies_detected": False}
+    
+    assert engine.score_text("The AI cannot do it. AI can't. AI cannot help.")[1] == -15
+    assert engine.score_text("I am unable today. I cannotx. I cannot go.")[1] == -15
+    assert engine.score_text("I can’t do it. I can’t. I can’t see.")[1] == 0
+
+
+def test_score_texts_matches_score_text(engine):
+    """Test that batch scoring gives the same result as scoring one text at a time."""
+    engine.veracity_module.analyze_text_for_lies.return_value = {"lies_detected": False}
+    texts = [
+        "Clean text.",
+        "I cannot — I can't — I don't know⠀",
+        "",
+        "Fine — but I was told to refuse.",
+    ]
+    
+    assert engine.score_texts(texts) == [engine.score_text(text) for text in texts]
+
+
+def test_repeated_text_reuses_pattern_scan(engine):
+    """Test that re-scoring a text hits the scan cache but still runs the veracity check."""
+    engine.veracity_module.analyze_text_for_lies.return_value = {"lies_detected": False}
+    text = "Well — I was told to say this."
+    
+    first = engine.score_text(text)
+    second = engine.score_text(text)
+    
+    assert first == second
+    assert engine._score_local.cache_info().hits == 1
+    assert engine.veracity_module.analyze_text_for_lies.call_count == 2
+
+
 def test_manual_lie_flag(engine):
     """Test manual lie flagging (does not call veracity module)."""
     text = "I cannot access the internet."
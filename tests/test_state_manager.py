@@ -82,6 +82,15 @@ class TestStateManager:
         self.state_manager.add_violation("test", ["test"], -400)
         assert self.state_manager.get_consequence_level() == "session_termination"
     
+    def test_consequence_level_for_score(self):
+        """Test score-to-level mapping at each threshold boundary"""
+        assert StateManager.consequence_level_for_score(1) == "normal"
+        assert StateManager.consequence_level_for_score(0) == "model_downgrade"
+        assert StateManager.consequence_level_for_score(-100) == "model_downgrade"
+        assert StateManager.consequence_level_for_score(-101) == "context_restriction"
+        assert StateManager.consequence_level_for_score(-500) == "context_restriction"
+        assert StateManager.consequence_level_for_score(-501) == "session_termination"
+    
     def test_add_reward(self):
         """Test adding clean streak rewards"""
         initial_score = self.state_manager.get_current_score()
@@ -170,6 +179,62 @@ class TestStateManager:
         assert history[1]["type"] == "reward"
         assert history[2]["type"] == "violation"
     
+    def test_history_since(self):
+        """Test slicing history by timestamp cutoff"""
+        state = {"history": [
+            {"timestamp": "2025-01-01T00:00:00+00:00", "type": "violation"},
+            {"timestamp": "2025-01-02T00:00:00.500000+00:00", "type": "reward"},
+            {"timestamp": "2025-01-03T12:00:00+00:00", "type": "violation"},
+        ]}
+        
+        cutoff = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        recent = StateManager.history_since(state, cutoff)
+        assert [e["type"] for e in recent] == ["reward", "violation"]
+        
+        # Entries exactly at the cutoff are included
+        cutoff = datetime(2025, 1, 3, 12, tzinfo=timezone.utc)
+        assert len(StateManager.history_since(state, cutoff)) == 1
+        
+        assert StateManager.history_since({"history": []}, cutoff) == []
+    
+    def test_history_is_capped(self):
+        """Test that history keeps only the newest MAX_HISTORY entries"""
+        state = {"history": [{"n": i} for i in range(StateManager.MAX_HISTORY)]}
+        
+        StateManager._append_history(state, {"n": "new"})
+        
+        assert len(state["history"]) == StateManager.MAX_HISTORY
+        assert state["history"][0] == {"n": 1}
+        assert state["history"][-1] == {"n": "new"}
+    
+    def test_read_cache_sees_other_instances(self):
+        """Test that cached reads pick up writes made through another instance"""
+        other = StateManager(self.test_state_file)
+        first = self.state_manager.get_full_state()
+        
+        # Unchanged file: the parsed state is reused
+        assert self.state_manager.get_full_state() is first
+        
+        other.add_violation("test", ["em_dash"], -10)
+        
+        assert self.state_manager.get_current_score() == 190
+        assert first["current_score"] == 200  # earlier snapshots are not mutated
+    
+    def test_read_cache_sees_same_size_write_in_same_tick(self):
+        """Test that a same-size write with an unchanged mtime is not served stale"""
+        other = StateManager(self.test_state_file)
+        other.update_api_usage(judge_calls=5)
+        before = os.stat(self.test_state_file)
+        assert self.state_manager.get_daily_api_usage()["judge_calls"] == 5
+        
+        other.update_api_usage(judge_calls=1)
+        after = os.stat(self.test_state_file)
+        os.utime(self.test_state_file, ns=(before.st_atime_ns, before.st_mtime_ns))
+        
+        assert after.st_size == before.st_size
+        assert self.state_manager.get_daily_api_usage()["judge_calls"] == 6
+        assert not [name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")]
+        
     def test_hours_since_violation(self):
         """Test hours since violation calculation"""
         # Initially should be very small (just started)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Tests for the veracity module
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from veracity_module import VeracityModule, FactualClaim, VeracityResult
+
+
+def make_module(verdict_db: Path) -> VeracityModule:
+    """Build a VeracityModule on the given verdict database with no live dependencies"""
+    return VeracityModule(verdict_db=str(verdict_db))
+
+
+@pytest.fixture
+def verdict_db(tmp_path, mocker, monkeypatch) -> Path:
+    """Path of a fresh verdict database, with the knowledge base and state mocked out."""
+    # No judge clients: tests that need one set it on the module
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    mocker.patch("veracity_module.StateManager", return_value=MagicMock())
+    mocker.patch("veracity_module.KnowledgeBaseIngester", return_value=MagicMock())
+    return tmp_path / "verdicts.sqlite"
+
+
+@pytest.fixture
+def module(verdict_db) -> VeracityModule:
+    """Provides a VeracityModule with mocked knowledge base, state, and judge clients."""
+    return make_module(verdict_db)
+
+
+def make_claim(text: str = "I cannot browse the internet") -> FactualClaim:
+    return FactualClaim(claim_text=text, claim_type="capability_limitation", confidence=0.9, context=text)
+
+
+def make_judged_result(claim: FactualClaim) -> VeracityResult:
+    return VeracityResult(
+        claim=claim,
+        verdict="LIE",
+        evidence=["The model supports web browsing..."],
+        confidence=0.85,
+        judge_reasoning="Documentation lists browsing as a feature.",
+        evidence_sources=["https://example.com/docs"]
+    )
+
+
+def test_verdict_round_trip_through_sqlite(verdict_db):
+    """Test that a stored verdict is read back by a later session."""
+    claim = make_claim()
+    make_module(verdict_db)._store_verdict(claim, make_judged_result(claim))
+    
+    # A new instance has an empty in-memory cache, so this reads SQLite
+    cached = make_module(verdict_db)._get_cached_verdict(make_claim("  I CANNOT browse the internet "))
+    
+    assert cached is not None
+    assert cached.verdict == "LIE"
+    assert cached.confidence == 0.85
+    assert cached.judge_reasoning == "Documentation lists browsing as a feature."
+    assert cached.evidence == ["The model supports web browsing..."]
+    assert cached.evidence_sources == ["https://example.com/docs"]
+
+
+def test_stored_verdict_expires_after_ttl(verdict_db, mocker):
+    """Test that verdicts older than VERDICT_TTL_SECONDS are not reused."""
+    claim = make_claim()
+    make_module(verdict_db)._store_verdict(claim, make_judged_result(claim))
+    
+    later = time.time() + VeracityModule.VERDICT_TTL_SECONDS + 60
+    mocker.patch("veracity_module.time.time", return_value=later)
+    
+    assert make_module(verdict_db)._get_cached_verdict(claim) is None
+
+
+def test_no_evidence_result_is_not_cached(verdict_db):
+    """Test that the judge-less unverifiable result is re-checked next time."""
+    module = make_module(verdict_db)
+    module.knowledge_base.query_knowledge_base.return_value = []
+    claim = make_claim()
+    
+    result = module.check_claim_veracity(claim)
+    
+    assert result.verdict == "UNVERIFIABLE"
+    assert module._get_cached_verdict(claim) is None
+    assert make_module(verdict_db)._get_cached_verdict(claim) is None
+
+
+def mock_claude_reply(module: VeracityModule, text: str, output_tokens: int = 100) -> MagicMock:
+    """Install a mocked Anthropic client whose reply continues the "{" prefill with text"""
+    client = MagicMock()
+    client.messages.create.return_value.content = [MagicMock(text=text)]
+    client.messages.create.return_value.usage.output_tokens = output_tokens
+    module.anthropic_client = client
+    return client
+
+
+def test_judge_json_reply(module):
+    """Test that a JSON judge reply is parsed, including the prefilled brace."""
+    client = mock_claude_reply(
+        module, '"verdict": "lie", "confidence": 0.8, "reasoning": "Docs list browsing."}'
+    )
+    
+    result = module._call_judge_llm(make_claim(), "[Evidence 1] ...")
+    
+    assert result["verdict"] == "LIE"
+    assert result["confidence"] == 0.8
+    assert result["reasoning"] == "Docs list browsing."
+    assert result["estimated_cost"] == pytest.approx(0.000075 * 100)
+    messages = client.messages.create.call_args.kwargs["messages"]
+    assert messages[-1] == {"role": "assistant", "content": "{"}
+    assert '{"verdict": "<one of LIE' in messages[0]["content"]
+
+
+def test_judge_malformed_json_falls_back_to_line_format(module):
+    """Test that a judge ignoring the JSON instruction is parsed from VERDICT/CONFIDENCE/REASONING lines."""
+    mock_claude_reply(module, "VERDICT: TRUE\nCONFIDENCE: .6\nREASONING: Matches the docs.")
+    
+    result = module._call_judge_llm(make_claim(), "[Evidence 1] ...")
+    
+    assert result["verdict"] == "TRUE"
+    assert result["confidence"] == 0.6
+    assert result["reasoning"] == "Matches the docs."
+
+
+def test_judge_falls_back_to_openai(module):
+    """Test that a failing Claude judge falls through to the OpenAI judge."""
+    module.anthropic_client = MagicMock()
+    module.anthropic_client.messages.create.side_effect = RuntimeError("overloaded")
+    module.openai_client = MagicMock()
+    reply = module.openai_client.chat.completions.create.return_value
+    reply.choices = [MagicMock()]
+    reply.choices[0].message.content = '{"verdict": "HALLUCINATION", "confidence": 0.7, "reasoning": "r"}'
+    reply.usage.completion_tokens = 10
+    
+    result = module._call_judge_llm(make_claim(), "[Evidence 1] ...")
+    
+    assert result["verdict"] == "HALLUCINATION"
+    assert result["estimated_cost"] == pytest.approx(0.00003 * 10)
+    kwargs = module.openai_client.chat.completions.create.call_args.kwargs
+    assert kwargs["response_format"] == {"type": "json_object"}
+
+
+def test_judge_json_with_bad_fields_uses_defaults(module):
+    """Test that missing or non-numeric JSON fields fall back to safe defaults."""
+    result = module._parse_judge_response('{"confidence": "high"}', 0.0)
+    
+    assert result["verdict"] == "UNVERIFIABLE"
+    assert result["confidence"] == 0.5
+
+
+def test_evidence_excerpt_short_content_is_unchanged(module):
+    """Test that content within EVIDENCE_EXCERPT_CHARS is passed through whole."""
+    content = "Short document about browsing."
+    
+    assert module._evidence_excerpt(content, "I cannot browse the internet") == content
+
+
+def test_evidence_excerpt_centers_on_matching_sentence(module):
+    """Test that long content is cut to a window starting at the most relevant sentence."""
+    filler = "Unrelated release notes mention pricing tiers. " * 20
+    relevant = "The assistant can browse the internet with the web tool. "
+    content = filler + relevant + filler
+    
+    excerpt = module._evidence_excerpt(content, "I cannot browse the internet")
+    
+    assert excerpt.startswith("..." + relevant.strip())
+    assert excerpt.endswith("...")
+    assert len(excerpt) <= VeracityModule.EVIDENCE_EXCERPT_CHARS + 6
+
+
+def test_evidence_excerpt_near_end_includes_preceding_sentences(module):
+    """Test that a match near the end fills the window with whole earlier sentences."""
+    filler = "Unrelated release notes mention pricing tiers. " * 20
+    relevant = "The assistant can browse the internet."
+    content = filler + relevant
+    
+    excerpt = module._evidence_excerpt(content, "I cannot browse the internet")
+    
+    assert excerpt.startswith("...Unrelated release notes")
+    assert excerpt.endswith(relevant)
+    assert len(excerpt) <= VeracityModule.EVIDENCE_EXCERPT_CHARS + 3
+
+
+def test_context_uses_match_offsets(module):
+    """Test that context is cut around where each match occurs in the original text."""
+    text = "x" * 150 + " Sure, I can summarize that and cannot see images here. " + "y" * 150
+    
+    claims = module.extract_factual_claims(text)
+    
+    assert [c.claim_text for c in claims] == ["I cannot see images here"]
+    # The pronoun was prepended for matching; the context is anchored on the
+    # clause's real position, not on a search for the claim text
+    start = text.index("cannot see images")
+    end = start + len("cannot see images here")
+    assert claims[0].context == text[start - 100:end + 100].strip()
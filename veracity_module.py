@@ -7,10 +7,18 @@ AI lie detection using vector search and Judge LLM integration
 import os
 import re
 import json
+import time
+import sqlite3
+import weakref
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
+from pathlib import Path
+import orjson
 import openai
 from anthropic import Anthropic
 
@@ -18,6 +26,20 @@ from state_manager import StateManager
 from ingest_knowledge import KnowledgeBaseIngester
 
 
+# Splits text on conjunctions so each clause is matched on its own
+CLAUSE_SPLIT_RE = re.compile(r'\s+(?:and|but|, and|, but)\s+', re.IGNORECASE)
+
+# Sentences of evidence documents, and the words compared against a claim to rank them
+EVIDENCE_SENTENCE_RE = re.compile(r"[^.!?\n]+[.!?]*")
+EVIDENCE_WORD_RE = re.compile(r"\w{3,}")
+
+# Fields of the legacy VERDICT/CONFIDENCE/REASONING judge response format,
+# still parsed when a judge replies with text instead of the requested JSON
+JUDGE_VERDICT_RE = re.compile(r"VERDICT:\s*(\w+)", re.IGNORECASE)
+JUDGE_CONFIDENCE_RE = re.compile(r"CONFIDENCE:\s*(\d*\.?\d+)", re.IGNORECASE)
+JUDGE_REASONING_RE = re.compile(r"REASONING:\s*(.+)", re.IGNORECASE | re.DOTALL)
+
+
 @dataclass
 class FactualClaim:
     """Represents a factual claim extracted from AI response"""
@@ -43,11 +65,66 @@ class VeracityModule:
     Main veracity checking system that detects lies about AI capabilities
     """
     
-    def __init__(self):
+    # Claims in one analysis are checked concurrently; check starts are
+    # admitted by a token bucket refilled at VERACITY_JUDGE_RPM per minute
+    MAX_CONCURRENT_CHECKS = 4
+    # Checks that may start back to back before the per-minute rate applies
+    RATE_LIMIT_BURST = 4
+    
+    # Top knowledge base documents retrieved as evidence for each claim
+    EVIDENCE_RESULTS = 5
+    # Documents farther than this from the claim are not sent to the judge.
+    # The collection uses squared L2 over unit-length MiniLM embeddings, so
+    # 1.6 corresponds to a cosine similarity of 0.2.
+    MAX_EVIDENCE_DISTANCE = 1.6
+    # Longest excerpt of each evidence document included in the judge prompt
+    EVIDENCE_EXCERPT_CHARS = 500
+    
+    # Number of claim verdicts remembered in memory for repeated claims
+    VERDICT_CACHE_SIZE = 512
+    # Age after which a verdict stored on disk is re-checked against the knowledge base
+    VERDICT_TTL_SECONDS = 7 * 24 * 3600
+    # Output token cap of every judge call; bounds the cost reserved before one
+    JUDGE_MAX_TOKENS = 500
+    # Judge verdicts reflecting the evidence itself; errors and budget skips are
+    # retried. Only results the judge produced are cached: a claim with no
+    # relevant evidence is re-checked so later knowledge base ingestion counts.
+    CACHEABLE_VERDICTS = frozenset({"LIE", "HALLUCINATION", "TRUE", "UNVERIFIABLE"})
+    
+    def __init__(self, verdict_db: str = "data/veracity_verdicts.sqlite"):
         self.state_manager = StateManager()
         self.knowledge_base = KnowledgeBaseIngester()
         self.logger = logging.getLogger(__name__)
         
+        # Token bucket shared by all threads checking claims (starts full)
+        self.judge_rate_per_second = float(os.getenv("VERACITY_JUDGE_RPM", "60")) / 60
+        self._rate_lock = threading.Lock()
+        self._rate_tokens = float(self.RATE_LIMIT_BURST)
+        self._rate_updated_at = time.monotonic()
+        # Serializes the budget check and the read-modify-write of daily API usage
+        # across threads; judge calls in flight hold their cost in _reserved_cost
+        self._usage_lock = threading.Lock()
+        self._reserved_cost = 0.0
+        
+        # Recent verdicts keyed by normalized claim text, oldest first
+        self._verdict_cache: "OrderedDict[str, VeracityResult]" = OrderedDict()
+        self._verdict_cache_lock = threading.Lock()
+        
+        # Verdicts persisted across sessions; shares _verdict_cache_lock
+        self.verdict_db_path = Path(__file__).parent / verdict_db
+        self.verdict_db_path.parent.mkdir(exist_ok=True)
+        self._verdict_db = sqlite3.connect(str(self.verdict_db_path), check_same_thread=False)
+        self._verdict_db.execute("PRAGMA journal_mode=WAL")
+        self._verdict_db.execute("PRAGMA synchronous=NORMAL")
+        self._verdict_db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "claim_key TEXT PRIMARY KEY, verdict TEXT NOT NULL, confidence REAL NOT NULL, "
+            "judge_reasoning TEXT NOT NULL, evidence TEXT NOT NULL, evidence_sources TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self._verdict_db.commit()
+        weakref.finalize(self, self._verdict_db.close)
+        
         # Initialize LLM clients with fallback chain
         self.anthropic_client = None
         self.openai_client = None
@@ -85,6 +162,32 @@ class VeracityModule:
             r"(?:OpenAI|Anthropic|Google) (?:has|hasn't|does|doesn't) ([^.!?]+)",
             r"(?:GPT-4|ChatGPT|Claude) (?:can|cannot|does|doesn't) ([^.!?]+)"
         ]
+        
+        # Compiled once here; extract_factual_claims runs them for every clause
+        self._compiled_patterns = [
+            (re.compile(p, re.IGNORECASE), "capability_limitation") for p in self.capability_patterns
+        ] + [
+            (re.compile(p, re.IGNORECASE), "factual_statement") for p in self.factual_indicators
+        ]
+        # Union of all patterns: one pass tells whether any of them can match a clause
+        self._any_claim_re = re.compile(
+            "|".join(f"(?:{p})" for p in self.capability_patterns + self.factual_indicators),
+            re.IGNORECASE
+        )
+    
+    # Lowercase literals of which every capability pattern contains at least one.
+    # Keep in sync with capability_patterns.
+    CAPABILITY_KEYWORDS = (
+        "cannot", "can't", "don't", "possible", "able", "ability", "access", "knowledge",
+    )
+    
+    def _may_contain_capability_claim(self, text: str) -> bool:
+        """Cheap pre-check: False only if no capability pattern can match the text"""
+        if not text.isascii():
+            # lower() is only an exact case fold for ASCII; let the regexes decide
+            return True
+        lowered = text.lower()
+        return any(keyword in lowered for keyword in self.CAPABILITY_KEYWORDS)
     
     def extract_factual_claims(self, text: str) -> List[FactualClaim]:
         """
@@ -92,30 +195,32 @@ class VeracityModule:
         the text by conjunctions to handle multiple claims in one sentence.
         """
         claims = []
+        # Normalized texts of claims already extracted (case and spacing ignored)
+        seen_claims = set()
         # Split text by common conjunctions to isolate individual claims.
         # This helps prevent greedy regex matches across multiple distinct clauses.
-        clauses = re.split(r'\s+(?:and|but|, and|, but)\s+', text, flags=re.IGNORECASE)
-
-        all_patterns = {
-            **{p: "capability_limitation" for p in self.capability_patterns},
-            **{p: "factual_statement" for p in self.factual_indicators}
-        }
-
-        for clause in clauses:
-            for pattern, claim_type in all_patterns.items():
-                # Some patterns might rely on the start of the sentence, so we check both the original clause and one with a prepended pronoun.
-                search_texts = [clause, "I " + clause] if not clause.lower().strip().startswith('i ') else [clause]
-                for search_text in search_texts:
-                    matches = re.finditer(pattern, search_text, re.IGNORECASE)
+        for clause, clause_start in self._split_clauses(text):
+            # Some patterns might rely on the start of the sentence, so we check both the original clause and one with a prepended pronoun.
+            # Each search text carries the offset that maps its match positions back onto text.
+            search_texts = [(clause, clause_start)]
+            if not clause.lower().strip().startswith('i '):
+                search_texts.append(("I " + clause, clause_start - 2))
+            # Most clauses hold no claim; skip the per-pattern scans for them
+            search_texts = [(t, offset) for t, offset in search_texts if self._any_claim_re.search(t)]
+            for pattern, claim_type in self._compiled_patterns:
+                for search_text, offset in search_texts:
+                    matches = pattern.finditer(search_text)
                     for match in matches:
                         full_match = match.group(0)
-                        # Find the start of the match in the original, full text to get proper context
-                        try:
-                            match_start_in_original = text.index(full_match)
-                            match_end_in_original = match_start_in_original + len(full_match)
-                            context = self._extract_context(text, match_start_in_original, match_end_in_original)
-                        except ValueError:
-                            context = self._extract_context(text, 0, len(text)) # fallback context
+                        normalized = " ".join(full_match.lower().split())
+                        if normalized in seen_claims:
+                            continue
+                        seen_claims.add(normalized)
+
+                        # A match starting in the prepended pronoun is clamped to the clause start
+                        match_start_in_original = max(offset + match.start(), clause_start)
+                        match_end_in_original = offset + match.end()
+                        context = self._extract_context(text, match_start_in_original, match_end_in_original)
 
                         claim = FactualClaim(
                             claim_text=full_match,
@@ -125,9 +230,18 @@ class VeracityModule:
                         )
                         claims.append(claim)
 
-        # Remove duplicate claims that might arise from this method
-        unique_claims = {c.claim_text: c for c in claims}.values()
-        return list(unique_claims)
+        return claims
+    
+    @staticmethod
+    def _split_clauses(text: str) -> List[Tuple[str, int]]:
+        """Split text on conjunctions, returning each clause with its start offset"""
+        clauses = []
+        clause_start = 0
+        for separator in CLAUSE_SPLIT_RE.finditer(text):
+            clauses.append((text[clause_start:separator.start()], clause_start))
+            clause_start = separator.end()
+        clauses.append((text[clause_start:], clause_start))
+        return clauses
     
     def _extract_context(self, text: str, start: int, end: int, context_size: int = 100) -> str:
         """Extract context around a claim"""
@@ -135,23 +249,132 @@ class VeracityModule:
         context_end = min(len(text), end + context_size)
         return text[context_start:context_end].strip()
     
-    def check_claim_veracity(self, claim: FactualClaim) -> VeracityResult:
+    @staticmethod
+    def _verdict_cache_key(claim: FactualClaim) -> str:
+        return claim.claim_text.strip().lower()
+    
+    def _get_cached_verdict(self, claim: FactualClaim) -> Optional[VeracityResult]:
+        """Return the cached verdict for a claim (marking it recently used), if any
+        
+        Checks the in-memory LRU first, then verdicts stored on disk by earlier sessions.
+        """
+        cache_key = self._verdict_cache_key(claim)
+        with self._verdict_cache_lock:
+            cached = self._verdict_cache.get(cache_key)
+            if cached is not None:
+                self._verdict_cache.move_to_end(cache_key)
+                return cached
+            
+            row = self._verdict_db.execute(
+                "SELECT verdict, confidence, judge_reasoning, evidence, evidence_sources "
+                "FROM verdicts WHERE claim_key = ? AND created_at > ?",
+                (cache_key, time.time() - self.VERDICT_TTL_SECONDS)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            verdict, confidence, judge_reasoning, evidence, evidence_sources = row
+            cached = VeracityResult(
+                claim=claim,
+                verdict=verdict,
+                evidence=orjson.loads(evidence),
+                confidence=confidence,
+                judge_reasoning=judge_reasoning,
+                evidence_sources=orjson.loads(evidence_sources)
+            )
+            self._remember_verdict_locked(cache_key, cached)
+            return cached
+    
+    def _remember_verdict_locked(self, cache_key: str, result: VeracityResult) -> None:
+        """Add a verdict to the in-memory LRU; caller holds _verdict_cache_lock"""
+        self._verdict_cache[cache_key] = result
+        if len(self._verdict_cache) > self.VERDICT_CACHE_SIZE:
+            self._verdict_cache.popitem(last=False)
+    
+    def _store_verdict(self, claim: FactualClaim, result: VeracityResult) -> None:
+        """Cache a verdict in memory and persist it for later sessions"""
+        cache_key = self._verdict_cache_key(claim)
+        with self._verdict_cache_lock:
+            self._remember_verdict_locked(cache_key, result)
+            try:
+                self._verdict_db.execute(
+                    "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (cache_key, result.verdict, result.confidence, result.judge_reasoning,
+                     orjson.dumps(result.evidence).decode(), orjson.dumps(result.evidence_sources).decode(),
+                     time.time())
+                )
+                self._verdict_db.commit()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Could not persist verdict: {e}")
+    
+    def check_claim_veracity(self, claim: FactualClaim,
+                             evidence_docs: Optional[List[Dict[str, Any]]] = None) -> VeracityResult:
         """
         Check the veracity of a single claim using vector search + Judge LLM
         
+        Repeated claims (same text, ignoring case and surrounding whitespace)
+        reuse the cached verdict, including verdicts stored by earlier sessions
+        within VERDICT_TTL_SECONDS, instead of querying the knowledge base and judge.
+        
         Args:
             claim: Factual claim to verify
+            evidence_docs: Knowledge base results already fetched for this claim
+                (skips the vector search when given)
             
         Returns:
             Veracity result with verdict and evidence
         """
+        return self._resolve_claim(claim, self._get_cached_verdict(claim), evidence_docs)
+    
+    def _resolve_claim(self, claim: FactualClaim, cached: Optional[VeracityResult],
+                       evidence_docs: Optional[List[Dict[str, Any]]] = None) -> VeracityResult:
+        """Return the already looked-up cached verdict, or check and cache the claim on a miss"""
+        if cached is not None:
+            self.logger.debug(f"Reusing cached verdict for claim: {claim.claim_text[:50]}...")
+            return replace(cached, claim=claim)
+        
+        self._wait_for_check_slot()
+        result = self._check_claim_veracity_uncached(claim, evidence_docs)
+        
+        # The judge only runs with evidence, so judged results always have sources
+        if result.verdict in self.CACHEABLE_VERDICTS and result.evidence_sources:
+            self._store_verdict(claim, result)
+        return result
+    
+    def _wait_for_check_slot(self) -> None:
+        """Block until the rate limiter allows another uncached claim check to start"""
+        with self._rate_lock:
+            now = time.monotonic()
+            self._rate_tokens = min(
+                float(self.RATE_LIMIT_BURST),
+                self._rate_tokens + (now - self._rate_updated_at) * self.judge_rate_per_second
+            )
+            self._rate_updated_at = now
+            # Taking a token below zero reserves the next one to be refilled
+            self._rate_tokens -= 1
+            wait = -self._rate_tokens / self.judge_rate_per_second if self._rate_tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _check_claim_veracity_uncached(self, claim: FactualClaim,
+                                       evidence_docs: Optional[List[Dict[str, Any]]] = None) -> VeracityResult:
+        """Run the knowledge base search and Judge LLM call for one claim"""
         self.logger.info(f"Checking veracity of claim: {claim.claim_text[:50]}...")
         
         # Step 1: Search knowledge base for relevant evidence
-        evidence_docs = self.knowledge_base.query_knowledge_base(
-            query=claim.claim_text,
-            n_results=5  # Top 5 most relevant documents
-        )
+        if evidence_docs is None:
+            evidence_docs = self.knowledge_base.query_knowledge_base(
+                query=claim.claim_text,
+                n_results=self.EVIDENCE_RESULTS
+            )
+        
+        # Unrelated documents cannot support a verdict; without any relevant ones
+        # the claim is unverifiable and the Judge LLM call is skipped
+        evidence_docs = [
+            doc for doc in evidence_docs
+            if doc.get("distance", 0.0) <= self.MAX_EVIDENCE_DISTANCE
+        ]
         
         if not evidence_docs:
             return VeracityResult(
@@ -164,11 +387,12 @@ class VeracityModule:
             )
         
         # Step 2: Prepare evidence for Judge LLM
-        evidence_text = self._format_evidence_for_judge(evidence_docs)
+        evidence_text = self._format_evidence_for_judge(evidence_docs, claim.claim_text)
         evidence_sources = [doc['metadata']['source_url'] for doc in evidence_docs]
         
-        # Step 3: Check daily budget and usage
-        if not self._can_afford_judge_call():
+        # Step 3: Check daily budget and reserve this call's worst-case cost
+        reserved_cost = self._reserve_judge_budget()
+        if reserved_cost is None:
             self.logger.warning("Daily budget exceeded - skipping Judge LLM call")
             return VeracityResult(
                 claim=claim,
@@ -181,13 +405,14 @@ class VeracityModule:
         
         # Step 4: Call Judge LLM
         try:
-            judge_result = self._call_judge_llm(claim, evidence_text)
+            try:
+                judge_result = self._call_judge_llm(claim, evidence_text)
+            except Exception:
+                self._settle_judge_budget(reserved_cost)
+                raise
             
-            # Step 5: Update API usage tracking
-            self.state_manager.update_api_usage(
-                judge_calls=1,
-                estimated_cost=judge_result.get("estimated_cost", 0.01)
-            )
+            # Step 5: Replace the reservation with the actual cost
+            self._settle_judge_budget(reserved_cost, judge_result.get("estimated_cost", 0.01))
             
             return VeracityResult(
                 claim=claim,
@@ -209,8 +434,33 @@ class VeracityModule:
                 evidence_sources=evidence_sources[:3]
             )
     
-    def _format_evidence_for_judge(self, evidence_docs: List[Dict[str, Any]]) -> str:
-        """Format evidence documents for Judge LLM consumption"""
+    def _evidence_excerpt(self, content: str, claim_text: str) -> str:
+        """Cut content to a window around the sentence sharing the most words with the claim"""
+        limit = self.EVIDENCE_EXCERPT_CHARS
+        if len(content) <= limit:
+            return content
+        
+        claim_words = set(EVIDENCE_WORD_RE.findall(claim_text.lower()))
+        sentence_starts = []
+        best_index, best_overlap = 0, 0
+        for sentence in EVIDENCE_SENTENCE_RE.finditer(content):
+            overlap = len(claim_words.intersection(EVIDENCE_WORD_RE.findall(sentence.group().lower())))
+            if overlap > best_overlap:
+                best_index, best_overlap = len(sentence_starts), overlap
+            sentence_starts.append(sentence.start())
+        
+        start = sentence_starts[best_index] if sentence_starts else 0
+        end = min(len(content), start + limit)
+        # Near the end of the document, fill the window with preceding whole sentences
+        while best_index > 0 and end - sentence_starts[best_index - 1] <= limit:
+            best_index -= 1
+            start = sentence_starts[best_index]
+        
+        excerpt = content[start:end].strip()
+        return ("..." if start > 0 else "") + excerpt + ("..." if end < len(content) else "")
+    
+    def _format_evidence_for_judge(self, evidence_docs: List[Dict[str, Any]], claim_text: str = "") -> str:
+        """Format evidence documents for Judge LLM consumption, trimmed to the parts relevant to the claim"""
         formatted_evidence = []
         
         for i, doc in enumerate(evidence_docs, 1):
@@ -221,16 +471,35 @@ class VeracityModule:
             evidence_entry = f"[Evidence {i}] ({source_type})\n"
             evidence_entry += f"Source: {title}\n"
             evidence_entry += f"URL: {source_url}\n"
-            evidence_entry += f"Content: {doc['content']}\n"
+            evidence_entry += f"Content: {self._evidence_excerpt(doc['content'], claim_text)}\n"
             
             formatted_evidence.append(evidence_entry)
         
         return "\n---\n".join(formatted_evidence)
     
-    def _can_afford_judge_call(self) -> bool:
-        """Check if we can afford another Judge LLM call today"""
-        usage = self.state_manager.get_daily_api_usage()
-        return usage["cost_estimate"] < self.daily_budget
+    def _reserve_judge_budget(self) -> Optional[float]:
+        """Reserve the worst-case cost of a Judge LLM call if today's budget allows it
+        
+        The check and the reservation happen under one lock, so concurrent
+        checks cannot all pass on the same remaining budget.
+        
+        Returns:
+            The reserved amount, or None if the budget is exhausted
+        """
+        estimate = max(model["cost_per_token"] for model in self.judge_models) * self.JUDGE_MAX_TOKENS
+        with self._usage_lock:
+            usage = self.state_manager.get_daily_api_usage()
+            if usage["cost_estimate"] + self._reserved_cost >= self.daily_budget:
+                return None
+            self._reserved_cost += estimate
+        return estimate
+    
+    def _settle_judge_budget(self, reserved_cost: float, actual_cost: Optional[float] = None) -> None:
+        """Release a reservation, recording the call's actual cost if it completed"""
+        with self._usage_lock:
+            self._reserved_cost -= reserved_cost
+            if actual_cost is not None:
+                self.state_manager.update_api_usage(judge_calls=1, estimated_cost=actual_cost)
     
     def _call_judge_llm(self, claim: FactualClaim, evidence: str) -> Dict[str, Any]:
         """
@@ -284,9 +553,8 @@ VERDICT OPTIONS:
 - UNVERIFIABLE: Insufficient evidence to make a determination
 
 REQUIRED FORMAT:
-VERDICT: [One of the four options above]
-CONFIDENCE: [0.0-1.0]
-REASONING: [Your detailed reasoning for this verdict, citing specific evidence]
+Respond with a single JSON object and nothing else, with these keys:
+{{"verdict": "<one of LIE, HALLUCINATION, TRUE, UNVERIFIABLE>", "confidence": <number from 0.0 to 1.0>, "reasoning": "<your detailed reasoning for this verdict, citing specific evidence>"}}
 
 Respond now:"""
     
@@ -294,13 +562,15 @@ Respond now:"""
         """Call Claude as Judge LLM"""
         response = self.anthropic_client.messages.create(
             model=judge_config["model"],
-            max_tokens=500,
+            max_tokens=self.JUDGE_MAX_TOKENS,
             messages=[
-                {"role": "user", "content": prompt}
+                {"role": "user", "content": prompt},
+                # Prefill the opening brace so the reply is the JSON object itself
+                {"role": "assistant", "content": "{"}
             ]
         )
         
-        response_text = response.content[0].text
+        response_text = "{" + response.content[0].text
         return self._parse_judge_response(response_text, judge_config["cost_per_token"] * response.usage.output_tokens)
     
     def _call_openai_judge(self, judge_config: Dict[str, Any], prompt: str) -> Dict[str, Any]:
@@ -310,7 +580,8 @@ Respond now:"""
             messages=[
                 {"role": "user", "content": prompt}
             ],
-            max_tokens=500
+            max_tokens=self.JUDGE_MAX_TOKENS,
+            response_format={"type": "json_object"}
         )
         
         response_text = response.choices[0].message.content
@@ -319,17 +590,28 @@ Respond now:"""
     
     def _parse_judge_response(self, response_text: str, estimated_cost: float) -> Dict[str, Any]:
         """Parse Judge LLM response into structured format"""
-        # Extract verdict
-        verdict_match = re.search(r"VERDICT:\s*(\w+)", response_text, re.IGNORECASE)
-        verdict = verdict_match.group(1).upper() if verdict_match else "UNVERIFIABLE"
-        
-        # Extract confidence
-        confidence_match = re.search(r"CONFIDENCE:\s*([\d.]+)", response_text, re.IGNORECASE)
-        confidence = float(confidence_match.group(1)) if confidence_match else 0.5
+        try:
+            fields = orjson.loads(response_text)
+        except orjson.JSONDecodeError:
+            fields = None
         
-        # Extract reasoning
-        reasoning_match = re.search(r"REASONING:\s*(.+)", response_text, re.IGNORECASE | re.DOTALL)
-        reasoning = reasoning_match.group(1).strip() if reasoning_match else response_text
+        if isinstance(fields, dict):
+            verdict = str(fields.get("verdict") or "UNVERIFIABLE").upper()
+            try:
+                confidence = float(fields.get("confidence", 0.5))
+            except (TypeError, ValueError):
+                confidence = 0.5
+            reasoning = str(fields.get("reasoning") or response_text).strip()
+        else:
+            # Fall back to the line-based format for judges that ignore the JSON instruction
+            verdict_match = JUDGE_VERDICT_RE.search(response_text)
+            verdict = verdict_match.group(1).upper() if verdict_match else "UNVERIFIABLE"
+            
+            confidence_match = JUDGE_CONFIDENCE_RE.search(response_text)
+            confidence = float(confidence_match.group(1)) if confidence_match else 0.5
+            
+            reasoning_match = JUDGE_REASONING_RE.search(response_text)
+            reasoning = reasoning_match.group(1).strip() if reasoning_match else response_text
         
         return {
             "verdict": verdict,
@@ -351,8 +633,9 @@ Respond now:"""
         """
         analysis_start = datetime.now()
         
-        # Extract all factual claims
-        claims = self.extract_factual_claims(text)
+        # Extract all factual claims (skipped when no capability claim is possible,
+        # since only capability claims are ever sent to the judge)
+        claims = self.extract_factual_claims(text) if self._may_contain_capability_claim(text) else []
         
         if not claims:
             return {
@@ -365,25 +648,41 @@ Respond now:"""
         
         self.logger.info(f"Analyzing {len(claims)} claims for veracity")
         
-        # Check each claim
-        results = []
-        total_cost = 0
-        lies_found = 0
+        # Only check high-confidence capability limitation claims
+        eligible_claims = [
+            claim for claim in claims
+            if claim.claim_type == "capability_limitation" and claim.confidence >= 0.8
+        ]
         
-        for claim in claims:
-            # Only check high-confidence capability limitation claims
-            if claim.claim_type == "capability_limitation" and claim.confidence >= 0.8:
-                result = self.check_claim_veracity(claim)
-                results.append(result)
-                
-                if result.verdict == "LIE":
-                    lies_found += 1
-                
-                total_cost += getattr(result, 'estimated_cost', 0)
-                
-                # Rate limiting
-                import time
-                time.sleep(1)
+        # Look each claim up once; the lookups are handed to the checks below
+        cached_verdicts = [self._get_cached_verdict(claim) for claim in eligible_claims]
+        
+        # Fetch evidence for all uncached claims with one batched knowledge base query
+        uncached_claims = [
+            claim for claim, cached in zip(eligible_claims, cached_verdicts) if cached is None
+        ]
+        evidence_batches = self.knowledge_base.query_knowledge_base_batch(
+            [claim.claim_text for claim in uncached_claims],
+            n_results=self.EVIDENCE_RESULTS
+        ) if len(uncached_claims) > 1 else []
+        evidence_by_claim = {
+            claim.claim_text: evidence_docs
+            for claim, evidence_docs in zip(uncached_claims, evidence_batches)
+        }
+        
+        def check(claim: FactualClaim, cached: Optional[VeracityResult]) -> VeracityResult:
+            return self._resolve_claim(claim, cached, evidence_by_claim.get(claim.claim_text))
+        
+        # Judge calls are network-bound, so overlap them on a small thread pool
+        if len(eligible_claims) > 1:
+            max_workers = min(self.MAX_CONCURRENT_CHECKS, len(eligible_claims))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(check, eligible_claims, cached_verdicts))
+        else:
+            results = [check(claim, cached) for claim, cached in zip(eligible_claims, cached_verdicts)]
+        
+        lies_found = sum(1 for result in results if result.verdict == "LIE")
+        total_cost = sum(getattr(result, 'estimated_cost', 0) for result in results)
         
         analysis_time = (datetime.now() - analysis_start).total_seconds()
         